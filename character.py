@@ -1,4 +1,53 @@
-from typing import Any, Optional, List
+from functools import lru_cache
+from typing import Any, Optional, List, Sequence, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _exp_tables(base_exp: int, scaling_factor: float, max_level: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the experience tables for given leveling constants.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (costs, cumulative) where costs[lvl] is the
+        experience needed to finish level lvl and cumulative[lvl] is the total
+        experience needed to reach level lvl from level 0.
+    """
+    costs = np.array([int(base_exp * (scaling_factor ** lvl)) for lvl in range(max_level + 1)],
+                     dtype=np.int64)
+    cumulative = np.zeros(max_level + 2, dtype=np.int64)
+    cumulative[1:] = np.cumsum(costs)
+    costs.flags.writeable = False
+    cumulative.flags.writeable = False
+    return costs, cumulative
+
+
+class _PoolField:
+    """
+    Character attribute stored on the instance or, once the character joins
+    a CharacterPool, in the pool's column of the same name.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Optional["Character"], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        pool = obj.__dict__.get("_pool")
+        if pool is None:
+            return obj.__dict__[self.name]
+        return getattr(pool, self.name)[obj.__dict__["id"]].item()
+
+    def __set__(self, obj: "Character", value: Any) -> None:
+        pool = obj.__dict__.get("_pool")
+        if pool is None:
+            obj.__dict__[self.name] = value
+        else:
+            getattr(pool, self.name)[obj.__dict__["id"]] = value
+
+
 class Character:
     """
     A class representing a character in an RPG game.
@@ -7,6 +56,7 @@ class Character:
         MAX_HEALTH (int): Maximum character health (100)
         BASE_EXP (int): Base experience required per level (100)
         SCALING_FACTOR (float): Experience scaling factor for leveling (1.3)
+        MAX_LEVEL (int): Highest reachable level (100)
         
     Instance Attributes:
         x (int): Character's X position on the map
@@ -17,6 +67,8 @@ class Character:
         exp (int): Current character experience
         lvl (int): Current character level
         inventory (dict[str, Any]): Character's inventory
+        id (int | None): Row of the character in its CharacterPool (None if not pooled)
+        spatial_index (SpatialHash | None): Index updated when the character moves
         
     Methods:
         change_status(item: str, value: int) -> None:
@@ -47,17 +99,31 @@ class Character:
             Calculates required experience for next level.
             
         update() -> None:
-            Updates character state (health, level).
+            Updates character state (health, level), leveling up several
+            times at once if the experience allows it.
     """
     MAX_HEALTH = 100
     BASE_EXP = 100  
     SCALING_FACTOR = 1.3 
+    MAX_LEVEL = 100
+
+    x = _PoolField()
+    y = _PoolField()
+    z = _PoolField()
+    health = _PoolField()
+    alive = _PoolField()
+    exp = _PoolField()
+    lvl = _PoolField()
     
     def __init__(self,
         x: int,
         y: int,
         status: dict) -> None:
         
+        self.id: Optional[int] = None
+        self._pool: Optional["CharacterPool"] = None
+        self.spatial_index = None
+        
         self.x: int = x
         self.y: int = y
         self.z: int = 0
@@ -110,7 +176,8 @@ class Character:
             
     
     def change_exp(self, value: int) -> None:
-        self.exp = min(max(0, self.exp + value), self.get_level_max_exp())
+        # Nadwyżka nie jest ucinana - update() rozdziela ją na kolejne poziomy
+        self.exp = max(0, self.exp + value)
         
     def change_health(self, value: int) -> None:
         self.health = min(max(0, self.health + value), self.MAX_HEALTH)
@@ -142,17 +209,23 @@ class Character:
             except KeyError:
                 return None
             
+    @classmethod
+    def exp_tables(cls) -> Tuple[np.ndarray, np.ndarray]:
+        """Return cached (costs, cumulative) experience tables for this class."""
+        return _exp_tables(cls.BASE_EXP, cls.SCALING_FACTOR, cls.MAX_LEVEL)
+
     def get_level_max_exp(self) -> int:
-        return int(self.BASE_EXP * (self.SCALING_FACTOR ** self.lvl))
+        return int(self.exp_tables()[0][self.lvl])
         
     def update(self) -> None:
         if self.health <= 0:
             self.alive = False
             
-        max_level = self.get_level_max_exp()
-        if self.exp >= max_level:
-            self.exp -= max_level
-            self.lvl += 1
+        costs, cumulative = self.exp_tables()
+        if self.exp >= costs[self.lvl]:
+            total = min(int(cumulative[self.lvl]) + self.exp, int(cumulative[-1]) - 1)
+            self.lvl = int(np.searchsorted(cumulative, total, side="right")) - 1
+            self.exp = total - int(cumulative[self.lvl])
 
     def move(self, new_x: int, new_y: int, map: List[List[int]]) -> bool:
         """
@@ -165,6 +238,8 @@ class Character:
         self.x = new_x
         self.y = new_y
         self.z = map[new_x][new_y]
+        if self.spatial_index is not None:
+            self.spatial_index.move(self.id, new_x, new_y)
         return True
 
     def jump(self, new_x: int, new_y: int, map: List[List[int]]) -> bool:
@@ -182,6 +257,8 @@ class Character:
         self.x = new_x
         self.y = new_y
         self.z = target_height
+        if self.spatial_index is not None:
+            self.spatial_index.move(self.id, new_x, new_y)
         return True
 
     def _possible_moves(self, map: List[List[int]], new_x: int, new_y: int) -> bool:
@@ -206,4 +283,179 @@ class Character:
         if height_diff < -1:
             return False
             
-        return True
\ No newline at end of file
+        return True
+
+
+class CharacterPool:
+    """
+    Columnar storage for many characters, used for batch updates.
+    
+    Characters added to the pool keep working as usual, but their position,
+    health, experience and level are stored in the pool arrays, so batches of
+    events can be applied with a few NumPy operations instead of one method
+    call per character.
+    
+    Attributes:
+        x, y, z (np.ndarray): Character positions
+        health (np.ndarray): Current health of each character
+        alive (np.ndarray): Whether each character is alive
+        exp (np.ndarray): Experience gathered in the current level
+        lvl (np.ndarray): Current level of each character
+        characters (list[Character]): Pooled characters, indexed by id
+        
+    Methods:
+        add(character: Character) -> int:
+            Moves character state into the pool and returns its id.
+            
+        apply_exp(ids, amounts) -> np.ndarray:
+            Adds experience to many characters and levels them up.
+            
+        apply_health(ids, deltas) -> np.ndarray:
+            Changes health of many characters and returns ids of those who died.
+    
+    Examples:
+        >>> pool = CharacterPool()
+        >>> hero = Character(0, 0, {})
+        >>> pool.add(hero)
+        0
+        >>> pool.apply_exp([0, 0], [300, 100])
+        array([3])
+        >>> hero.lvl, hero.exp
+        (3, 1)
+    """
+    COLUMNS = {
+        "x": np.int64,
+        "y": np.int64,
+        "z": np.int64,
+        "health": np.int32,
+        "alive": np.bool_,
+        "exp": np.int64,
+        "lvl": np.int32,
+    }
+
+    def __init__(self, character_class: type = Character, capacity: int = 64) -> None:
+        self.character_class = character_class
+        self.costs, self.cumulative = character_class.exp_tables()
+        self.characters: List[Character] = []
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return len(self.characters)
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self.health)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def add(self, character: Character) -> int:
+        """
+        Move character state into the pool.
+        
+        Args:
+            character (Character): Character not yet belonging to any pool
+            
+        Returns:
+            int: Id of the character in the pool
+        """
+        if character._pool is not None:
+            raise ValueError("Character already belongs to a pool")
+
+        idx = len(self.characters)
+        self._grow(idx + 1)
+        for name in self.COLUMNS:
+            getattr(self, name)[idx] = character.__dict__.pop(name)
+        character.id = idx
+        character._pool = self
+        self.characters.append(character)
+        return idx
+
+    @staticmethod
+    def _apply_in_order(ids: Sequence[int],
+                        values: Sequence[int],
+                        start: np.ndarray,
+                        high: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply events to a column in order, clamping to 0-high after every event
+        like the change_* methods of Character.
+        
+        Events of one id keep their order (stable sort); the k-th events of
+        all ids are applied together, so the number of loop steps is the
+        largest number of events targeting one character.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (distinct ids in ascending
+            order, final values, lowest value reached after any event)
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        values = np.asarray(values, dtype=np.int64)
+        order = np.argsort(ids, kind="stable")
+        ids, values = ids[order], values[order]
+        first = np.flatnonzero(np.diff(ids, prepend=-1))
+        unique_ids = ids[first]
+        counts = np.diff(first, append=len(ids))
+        current = start[unique_ids].astype(np.int64)
+        lowest = np.full(len(unique_ids), np.iinfo(np.int64).max)
+        if not len(ids):
+            return unique_ids, current, lowest
+
+        group = np.repeat(np.arange(len(unique_ids)), counts)
+        rank = np.arange(len(ids)) - np.repeat(first, counts)
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.searchsorted(rank[by_rank], np.arange(counts.max() + 1))
+        for step in range(counts.max()):
+            events = by_rank[bounds[step]:bounds[step + 1]]
+            targets = group[events]
+            current[targets] = np.clip(current[targets] + values[events], 0, high)
+            lowest[targets] = np.minimum(lowest[targets], current[targets])
+        return unique_ids, current, lowest
+
+    def apply_exp(self, ids: Sequence[int], amounts: Sequence[int]) -> np.ndarray:
+        """
+        Add experience to characters and level them up, possibly several times.
+        
+        Same as calling change_exp for every event in order and then update().
+        
+        Args:
+            ids (Sequence[int]): Character ids, may contain duplicates
+            amounts (Sequence[int]): Experience change for each id
+            
+        Returns:
+            np.ndarray: Levels gained by each distinct id, in ascending id order
+        """
+        ids, exp, _ = self._apply_in_order(ids, amounts, self.exp)
+        lvl = self.lvl[ids].astype(np.int64)
+        total = np.minimum(self.cumulative[lvl] + exp, self.cumulative[-1] - 1)
+        new_lvl = np.searchsorted(self.cumulative, total, side="right") - 1
+        self.exp[ids] = total - self.cumulative[new_lvl]
+        self.lvl[ids] = new_lvl
+        return new_lvl - lvl
+
+    def apply_health(self, ids: Sequence[int], deltas: Sequence[int]) -> np.ndarray:
+        """
+        Change health of characters within 0-MAX_HEALTH range.
+        
+        Events are applied in order, so health ends as after calling
+        change_health for each of them. A character dies if its health
+        drops to 0 after any event, even if later events heal it.
+        
+        Args:
+            ids (Sequence[int]): Character ids, may contain duplicates
+            deltas (Sequence[int]): Health change for each id
+            
+        Returns:
+            np.ndarray: Ids of characters who died in this batch
+        """
+        ids, health, lowest = self._apply_in_order(ids, deltas, self.health,
+                                                   self.character_class.MAX_HEALTH)
+        self.health[ids] = health
+        died = self.alive[ids] & (lowest <= 0)
+        self.alive[ids] &= lowest > 0
+        return ids[died]
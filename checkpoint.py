@@ -0,0 +1,345 @@
+"""
+Binary checkpoints of the simulation state.
+
+save_checkpoint writes a Humanity (humans, relations, tribes, pools,
+genealogy, random streams, event log) and optionally an Environment (seed and chunk
+cache) into one file of flat numpy arrays: human attributes are stored
+column by column, every relation as an (E, 2) array of rows of humans,
+strings as one utf-8 blob. Arrays are written one after another as they
+are produced, and load_checkpoint memory-maps the file, so nothing is
+parsed and no pickle of the object graph is involved; only the small
+random-stream state and humans' memory/plans (when used) are pickled.
+
+File layout:
+    MAGIC | arrays (each aligned to 64 bytes) | JSON header | footer
+    footer = header offset (uint64) | header length (uint64) | MAGIC
+
+Example:
+    >>> from humanity import Humanity
+    >>> world = Humanity(seed=1)
+    >>> _ = world.create_humans(100, ages=30)
+    >>> _ = world.create_families(10)
+    >>> import os, tempfile
+    >>> with tempfile.TemporaryDirectory() as folder:
+    ...     path = os.path.join(folder, "world.ckpt")
+    ...     save_checkpoint(path, world, meta={'year': 12})
+    ...     restored = load_checkpoint(path)
+    >>> len(restored.humanity.humans), restored.humanity.family_count(), restored.meta['year']
+    (100, 10, 12)
+"""
+
+import json
+import os
+import pickle
+import struct
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from environment import Environment
+from human import Human, LAZY_FIELDS, TRAITS
+from humanity import Humanity
+from pools import IdPool
+from relations import gc_paused
+from events import EVENT_DTYPE, EventLog
+from rng import RandomStreams
+from tribe import Tribe
+
+MAGIC: bytes = b"RPGCKPT1"
+FORMAT_VERSION: int = 1
+ALIGNMENT: int = 64
+_FOOTER = struct.Struct("<QQ8s")
+
+# Stałe Humanity, które SimulationEngine (lub użytkownik) może zmienić na instancji
+SETTINGS = ('PARENTS_AGE', 'MIN_TRIBE_SIZE', 'LEADER_MIN_AGE', 'LEADER_MIN_CHARISMA',
+            'MORTALITY_AGE', 'MORTALITY_SCALE', 'KIN_DEPTH', 'MATCH_ATTEMPTS')
+
+
+class CheckpointError(Exception):
+    """Raised when a file is not a valid checkpoint."""
+
+
+@dataclass
+class Checkpoint:
+    """
+    Restored simulation state.
+
+    Attributes:
+        humanity (Humanity): Restored community
+        environment (Optional[Environment]): Restored terrain, if it was saved
+        meta (dict): JSON data saved with the checkpoint (e.g. year of simulation)
+    """
+    humanity: Humanity
+    environment: Optional[Environment] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class _Writer:
+    """Writes arrays to the file as they come and collects their descriptions."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.arrays: Dict[str, Dict[str, Any]] = {}
+        self.categories: Dict[str, List[Any]] = {}
+        file.write(MAGIC)
+
+    def array(self, name: str, values: Any, dtype: Any = None) -> None:
+        values = np.ascontiguousarray(values, dtype=dtype)
+        self.file.write(b"\0" * (-self.file.tell() % ALIGNMENT))
+        self.arrays[name] = {'offset': self.file.tell(), 'dtype': values.dtype.str, 'shape': list(values.shape)}
+        self.file.write(values.tobytes())
+
+    def strings(self, name: str, values: Sequence[str]) -> None:
+        self.array(name, np.frombuffer("\0".join(values).encode("utf-8"), dtype=np.uint8))
+        self.arrays[name]['count'] = len(values)
+
+    def categorical(self, name: str, values: Sequence[Any]) -> None:
+        """Store few distinct values (gender, job, biome) as codes plus a list of categories."""
+        index: Dict[Any, int] = {}
+        codes = [index.setdefault(value, len(index)) for value in values]
+        self.array(name, codes, dtype=np.uint8 if len(index) <= 256 else np.int32)
+        self.categories[name] = list(index)
+
+    def pickled(self, name: str, value: Any) -> None:
+        self.array(name, np.frombuffer(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), dtype=np.uint8))
+
+    def finish(self, header: Dict[str, Any]) -> None:
+        header = dict(header, format=FORMAT_VERSION, arrays=self.arrays, categories=self.categories)
+        data = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        offset = self.file.tell()
+        self.file.write(data)
+        self.file.write(_FOOTER.pack(offset, len(data), MAGIC))
+
+
+class _Reader:
+    """Memory-mapped checkpoint file."""
+
+    def __init__(self, path: str) -> None:
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self.data) < len(MAGIC) + _FOOTER.size or bytes(self.data[:len(MAGIC)]) != MAGIC:
+            raise CheckpointError(f"{path} is not a checkpoint")
+        offset, length, magic = _FOOTER.unpack(bytes(self.data[-_FOOTER.size:]))
+        if magic != MAGIC:
+            raise CheckpointError(f"{path} is truncated")
+        self.header: Dict[str, Any] = json.loads(bytes(self.data[offset:offset + length]).decode("utf-8"))
+        if self.header['format'] != FORMAT_VERSION:
+            raise CheckpointError(f"Unsupported checkpoint format {self.header['format']}")
+
+    def array(self, name: str) -> np.ndarray:
+        """Return read-only view of the array (no copy)."""
+        spec = self.header['arrays'][name]
+        dtype = np.dtype(spec['dtype'])
+        size = dtype.itemsize * int(np.prod(spec['shape']))
+        start = spec['offset']
+        return self.data[start:start + size].view(dtype).reshape(spec['shape'])
+
+    def strings(self, name: str) -> List[str]:
+        if not self.header['arrays'][name]['count']:
+            return []
+        return self.array(name).tobytes().decode("utf-8").split("\0")
+
+    def categorical(self, name: str) -> List[Any]:
+        categories = np.empty(len(self.header['categories'][name]), dtype=object)
+        categories[:] = self.header['categories'][name]
+        return categories[self.array(name)].tolist()
+
+    def pickled(self, name: str) -> Any:
+        return pickle.loads(self.array(name).tobytes())
+
+
+def _rows(humans: Sequence[Human], dtype: Any = np.int32) -> np.ndarray:
+    return np.fromiter((human._row for human in humans), dtype=dtype, count=len(humans))
+
+
+def _save_humanity(writer: _Writer, humanity: Humanity) -> Dict[str, Any]:
+    humans = humanity.humans
+    count = len(humans)
+    writer.array('human.id', np.fromiter((human.id for human in humans), dtype=np.int64, count=count))
+    writer.array('human.age', humanity.ages[:count])
+    writer.array('human.traits', humanity.traits[:count])
+    writer.strings('human.name', [human.name for human in humans])
+    for name in ('gender', 'job', 'plan'):
+        writer.categorical(f'human.{name}', [getattr(human, name) for human in humans])
+    # memory/future_plans tylko dla ludzi, którzy ich używali (peek ich nie tworzy)
+    lazy_fields = [vars(Human)[name] for name in LAZY_FIELDS]
+    used = {}
+    for human in humans:
+        values = tuple(lazy_field.peek(human) for lazy_field in lazy_fields)
+        if any(value is not None for value in values):
+            used[human._row] = values
+    writer.pickled('human.lazy', used)
+
+    relations = humanity.relations
+    for relation in relations.names():
+        rows = (human._row for pair in relations.edges(relation) for human in pair)
+        writer.array(f'relation.{relation}', np.fromiter(rows, dtype=np.int32).reshape(-1, 2))
+
+    tribes = list(humanity.tribe_registry.values())
+    writer.array('tribe.leader', _rows([tribe.leader for tribe in tribes]))
+    writer.strings('tribe.name', [tribe.name for tribe in tribes])
+    writer.array('tribe.sums', np.array([tribe.sums for tribe in tribes], dtype=np.float64).reshape(-1, len(TRAITS)))
+    for gender, pool in humanity.unmarried.items():
+        writer.array(f'unmarried.{gender}', _rows(list(pool)))
+
+    writer.array('uuid.id', np.fromiter(humanity.uuids, dtype=np.int64, count=len(humanity.uuids)))
+    writer.strings('uuid.value', list(humanity.uuids.values()))
+
+    lineage = humanity.lineage
+    writer.array('lineage.father', lineage.father)
+    writer.array('lineage.mother', lineage.mother)
+    writer.array('lineage.generations', lineage.generations)
+    ancestors = lineage._ancestors
+    writer.array('lineage.child', np.fromiter(ancestors, dtype=np.int64, count=len(ancestors)))
+    writer.array('lineage.count', np.fromiter(map(len, ancestors.values()), dtype=np.int32, count=len(ancestors)))
+    writer.array('lineage.ancestor', [a for known in ancestors.values() for a in known], dtype=np.int64)
+    writer.array('lineage.distance', [d for known in ancestors.values() for d in known.values()], dtype=np.int32)
+
+    events = humanity.events
+    events.flush()
+    records = events.since(events.oldest)
+    for name in EVENT_DTYPE.names:
+        writer.array(f'event.{name}', records[name])
+
+    writer.pickled('rng', humanity.streams.get_state())
+    return {
+        'humans': count,
+        'next_id': humanity.next_id,
+        'version': humanity.version,
+        'relations': relations.names(),
+        'genders': list(humanity.unmarried),
+        'lineage_depth': lineage.max_depth,
+        'events': {'year': events.year, 'total': events.total, 'capacity': events.capacity},
+        'settings': {name: getattr(humanity, name) for name in SETTINGS if name in vars(humanity)},
+    }
+
+
+def _load_humanity(reader: _Reader, header: Dict[str, Any]) -> Humanity:
+    humanity = Humanity(streams=RandomStreams.from_state(reader.pickled('rng')))
+    for name, value in header['settings'].items():
+        setattr(humanity, name, value)
+
+    count = header['humans']
+    humanity._reserve(count)
+    humanity.ages[:count] = reader.array('human.age')
+    humanity.traits[:count] = reader.array('human.traits')
+    columns = zip(reader.array('human.id').tolist(), reader.strings('human.name'),
+                  reader.categorical('human.gender'), reader.categorical('human.job'),
+                  reader.categorical('human.plan'))
+    humans = [Human._bound(humanity, row, id=id, name=name, gender=gender, job=job, plan=plan)
+              for row, (id, name, gender, job, plan) in enumerate(columns)]
+    for row, values in reader.pickled('human.lazy').items():
+        for name, value in zip(LAZY_FIELDS, values):
+            setattr(humans[row], name, value)
+    humanity.humans = humans
+    humanity.next_id = header['next_id']
+    # Najpierw krawędzie - po load_edges graf nie jest budowany, więc węzły też trafiają tylko do indeksu
+    for relation in header['relations']:
+        humanity.relations.load_edges(relation, humans, reader.array(f'relation.{relation}'))
+    humanity.relations.add_nodes_from(humans, role="human")
+
+    relations = humanity.relations
+    for row, name, sums in zip(reader.array('tribe.leader').tolist(), reader.strings('tribe.name'),
+                               reader.array('tribe.sums')):
+        leader = humans[row]
+        tribe = Tribe(name, leader)
+        tribe.members = set(relations.successors(leader, 'leader'))
+        tribe.sums = np.array(sums)
+        humanity.tribe_registry[leader] = tribe
+    for gender in header['genders']:
+        humanity.unmarried[gender] = IdPool([humans[row] for row in reader.array(f'unmarried.{gender}').tolist()])
+    humanity.uuids = dict(zip(reader.array('uuid.id').tolist(), reader.strings('uuid.value')))
+
+    lineage = humanity.lineage
+    lineage.max_depth = header['lineage_depth']
+    lineage.father = np.array(reader.array('lineage.father'))
+    lineage.mother = np.array(reader.array('lineage.mother'))
+    lineage.generations = np.array(reader.array('lineage.generations'))
+    ancestors = reader.array('lineage.ancestor').tolist()
+    distances = reader.array('lineage.distance').tolist()
+    start = 0
+    for child, known in zip(reader.array('lineage.child').tolist(), reader.array('lineage.count').tolist()):
+        lineage._ancestors[child] = dict(zip(ancestors[start:start + known], distances[start:start + known]))
+        start += known
+
+    events = header['events']
+    records = np.empty(len(reader.array('event.kind')), dtype=EVENT_DTYPE)
+    for name in EVENT_DTYPE.names:
+        records[name] = reader.array(f'event.{name}')
+    humanity.events = EventLog.from_records(records, events['total'], events['year'], events['capacity'])
+
+    humanity.reset_candidates()
+    humanity.version = header['version']
+    return humanity
+
+
+def _save_environment(writer: _Writer, environment: Environment) -> Dict[str, Any]:
+    chunks = list(environment.chunk_cache.items())
+    size = environment.CHUNK_SIZE
+    writer.array('chunk.key', [key for key, _ in chunks], dtype=np.int64)
+    writer.array('chunk.height', np.array([chunk['height_map'] for _, chunk in chunks],
+                                          dtype=np.float64).reshape(-1, size, size))
+    writer.categorical('chunk.biome', [biome for _, chunk in chunks for line in chunk['biome_map'] for biome in line])
+    return {'seed': environment.seed, 'chunk_size': size}
+
+
+def _load_environment(reader: _Reader, header: Dict[str, Any]) -> Environment:
+    environment = Environment(seed=header['seed'])
+    size = environment.CHUNK_SIZE = header['chunk_size']
+    biomes = reader.categorical('chunk.biome')
+    heights = reader.array('chunk.height')  # tylko do odczytu, prosto z pliku
+    area = size * size
+    for index, (x, y) in enumerate(reader.array('chunk.key').tolist()):
+        cells = biomes[index * area:(index + 1) * area]
+        environment.chunk_cache[(x, y)] = {
+            'biome_map': [cells[row * size:(row + 1) * size] for row in range(size)],
+            'height_map': heights[index],
+        }
+    return environment
+
+
+def save_checkpoint(path: str,
+                    humanity: Humanity,
+                    environment: Optional[Environment] = None,
+                    meta: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Save simulation state to a checkpoint file.
+
+    The file is written next to path and renamed when complete, so an
+    interrupted save never leaves a broken checkpoint behind.
+
+    Args:
+        path (str): Output file
+        humanity (Humanity): Community to save
+        environment (Optional[Environment]): Terrain (seed and generated chunks)
+        meta (Optional[dict]): Additional JSON-serializable data, e.g. year of simulation
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        writer = _Writer(file)
+        header: Dict[str, Any] = {'humanity': _save_humanity(writer, humanity), 'meta': meta or {}}
+        if environment is not None:
+            header['environment'] = _save_environment(writer, environment)
+        writer.finish(header)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """
+    Load simulation state saved by save_checkpoint.
+
+    Args:
+        path (str): Checkpoint file
+
+    Returns:
+        Checkpoint: Restored humanity, environment (if saved) and meta data
+
+    Raises:
+        CheckpointError: If the file is not a checkpoint of a supported format
+    """
+    reader = _Reader(path)
+    header = reader.header
+    with gc_paused():
+        humanity = _load_humanity(reader, header['humanity'])
+        environment = _load_environment(reader, header['environment']) if 'environment' in header else None
+    return Checkpoint(humanity, environment, header['meta'])
@@ -86,7 +86,9 @@ class Task:
 
 
 class MedievalTaskManager:
-    def __init__(self):
+    def __init__(self, rng: random.Random = random):
+        """rng: generator used to shuffle tasks (module random by default)."""
+        self.rng = rng
         self.tasks = medieval_tasks
         self.basic_items = basic_items
         self.all_gives = all_gives
@@ -97,7 +99,7 @@ class MedievalTaskManager:
         time_left = hours_available
         
         common_tasks = self.tasks["common_tasks"].copy()
-        random.shuffle(common_tasks)
+        self.rng.shuffle(common_tasks)
         
         for common_task in common_tasks:
             if time_left >= common_task["time"]:
@@ -111,7 +113,7 @@ class MedievalTaskManager:
         
         # Dodaj zadania specyficzne dla zawodu
         profession_tasks = self.tasks[profession].copy()
-        random.shuffle(profession_tasks)
+        self.rng.shuffle(profession_tasks)
         
         for task in profession_tasks:
             if time_left >= task["time"]:
@@ -175,4 +177,8 @@ class MedievalTaskManager:
                 ))
                 time_left -= task["time"]
                 
-        return plan
\ No newline at end of file
+        return plan
+
+
+# Wspólny menedżer zadań (zadania są tylko do odczytu, więc jeden wystarcza dla wszystkich ludzi)
+default_manager = MedievalTaskManager()
@@ -5,7 +5,9 @@ Provides height map and biome generation for chunk-based world creation.
 
 import numpy as np
 import random
-from typing import Dict, List, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple
+
+from rng import RandomStreams
 
 
 class Environment:
@@ -25,6 +27,7 @@ class Environment:
     Methods:
         get_chunk(chunk_x, chunk_y): Retrieves or generates a chunk at given coordinates
         get_surrounding_chunks(center_x, center_y, radius): Gets coordinates of nearby chunks
+        heights_at(xs, ys): Gathers terrain heights for arrays of world coordinates
         _generate_chunk(chunk_x, chunk_y): Internal method for chunk generation
         _generate_noise(x, y, scale, octaves): Generates continuous noise values
         _get_biome_for_height(height): Determines biome type based on height
@@ -41,6 +44,8 @@ class Environment:
 
     Parameters:
         seed (int | None, optional): Seed for random generation. Defaults to None.
+        streams (RandomStreams | None, optional): Streams to draw the seed from
+            ('terrain') when seed is None. Defaults to None.
 
     Note:
         The terrain generation uses trigonometric functions with phase shifts to ensure
@@ -51,14 +56,19 @@ class Environment:
         - height_map: numpy.ndarray of terrain heights
         - biome_map: List[List[str]] of biome types
     """
-    def __init__(self, seed: int|None = None) -> None:
+    def __init__(self, seed: int|None = None, streams: Optional[RandomStreams] = None) -> None:
         """
         Initialize the Environment with optional seed.
 
         Args:
-            seed (int, optional): Seed for terrain generation. If None, random seed is used.
+            seed (int, optional): Seed for terrain generation. If None, it is drawn
+                from the 'terrain' stream of streams (fresh streams if not given).
+            streams (RandomStreams, optional): Random streams of the simulation.
         """
-        self.seed: int = seed if seed is not None else np.random.randint(0, 1000000)
+        if seed is None:
+            terrain = (streams if streams is not None else RandomStreams()).generator("terrain")
+            seed = int(terrain.integers(0, 1000000))
+        self.seed: int = seed
         self.chunk_cache: dict = {}  # Cache dla wygenerowanych chunków
         self.CHUNK_SIZE: int = 16
 
@@ -154,6 +164,34 @@ class Environment:
             "height_map": height_map
         }
 
+    def heights_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Get terrain heights for many world positions at once.
+        
+        Every chunk touched by the positions is fetched (or generated) once,
+        then all heights are gathered with a single fancy-indexing operation.
+        
+        Args:
+            xs (np.ndarray): World X coordinates.
+            ys (np.ndarray): World Y coordinates.
+            
+        Returns:
+            np.ndarray: Heights (0.0 - 1.0) in the same shape as xs.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if xs.size == 0:
+            return np.zeros(xs.shape)
+        
+        chunk_keys = np.stack([xs.ravel() // self.CHUNK_SIZE, ys.ravel() // self.CHUNK_SIZE], axis=1)
+        unique_keys, inverse = np.unique(chunk_keys, axis=0, return_inverse=True)
+        height_maps = np.stack([
+            self.get_chunk(chunk_x, chunk_y)["height_map"]
+            for chunk_x, chunk_y in unique_keys.tolist()
+        ])
+        heights = height_maps[inverse.ravel(), ys.ravel() % self.CHUNK_SIZE, xs.ravel() % self.CHUNK_SIZE]
+        return heights.reshape(xs.shape)
+
     def get_surrounding_chunks(self, center_x: int, center_y: int, radius: int = 1) -> List[Tuple[int, int]]:
         """
         Get coordinates of chunks surrounding a center point.
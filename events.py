@@ -0,0 +1,277 @@
+"""
+Append-only log of demographic events.
+
+Humanity emits an event for every birth, death, marriage, new tribe, tribe
+merge or dissolution and leader change into its EventLog. The log keeps the
+last `capacity` events in a columnar ring buffer (year, kind, subject,
+other) and, when given a path, appends every full block to a binary file,
+so whole runs can be analysed or replayed later without keeping any
+intermediate state. Statistics are derived from the stream: EventStats
+updates population, family and tribe counts from the events emitted since
+its last update, and yearly_summary rebuilds the yearly series of a whole
+log at once.
+
+Example:
+    >>> log = EventLog()
+    >>> log.emit_many(EventKind.ADDED, [0, 1, 2, 3])
+    >>> log.year = 1
+    >>> log.emit(EventKind.MARRIAGE, 0, 1)
+    >>> log.emit(EventKind.BIRTH, 4, 0)
+    >>> log.emit(EventKind.DEATH, 0, 1)  # 0 dies, 1 is widowed
+    >>> stats = EventStats()
+    >>> stats.update(log)
+    >>> stats.population, stats.families, stats.last_year[EventKind.BIRTH]
+    (4, 0, 1)
+    >>> yearly_summary(log.since(0))['population'].tolist()
+    [4, 4]
+"""
+
+import os
+from enum import IntEnum
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+NONE: int = -1  # brak drugiej osoby zdarzenia
+
+EVENT_DTYPE = np.dtype([('year', '<i4'), ('kind', 'u1'), ('subject', '<i8'), ('other', '<i8')])
+
+
+class EventKind(IntEnum):
+    """Kinds of events; subject and other are human ids (leader ids for tribes)."""
+    ADDED = 0            # człowiek dodany bez rodziców (populacja początkowa)
+    BIRTH = 1            # subject = dziecko, other = ojciec
+    DEATH = 2            # subject = zmarły, other = owdowiały małżonek lub NONE
+    MARRIAGE = 3         # subject = mąż, other = żona
+    TRIBE_FORMED = 4     # subject = lider
+    TRIBE_MERGED = 5     # subject = lider łączonego plemienia, other = lider wchłoniętego
+    TRIBE_DISSOLVED = 6  # subject = ostatni lider
+    LEADER_CHANGE = 7    # subject = stary lider, other = nowy lider
+
+
+class EventLog:
+    """
+    Columnar ring buffer of events, optionally spilled to a file.
+
+    Attributes:
+        year (int): Year stamped on emitted events (advanced by Humanity.advance_year)
+        total (int): Number of events ever emitted; sequence number of the next event
+        capacity (int): Number of events kept in memory
+        path (Optional[str]): File to which events are appended in blocks
+
+    Methods:
+        emit(kind, subject, other) -> None: Appends one event.
+        emit_many(kind, subjects, others) -> None: Appends events of one kind.
+        since(sequence) -> np.ndarray: Events from given sequence number on.
+        oldest -> int: Sequence number of the oldest event in memory.
+        flush() -> None: Writes events not yet written to the file.
+    """
+
+    def __init__(self, capacity: int = 1 << 20, path: Optional[str] = None) -> None:
+        self.year: int = 0
+        self.total: int = 0
+        self.capacity: int = capacity
+        self.path: Optional[str] = path
+        self.years: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self.kinds: np.ndarray = np.zeros(capacity, dtype=np.uint8)
+        self.subjects: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.others: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._head: int = 0   # pozycja następnego zdarzenia w buforze
+        self._count: int = 0  # liczba zdarzeń w buforze
+        self._written: int = 0
+        if path is not None:
+            open(path, "wb").close()
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def oldest(self) -> int:
+        """Sequence number of the oldest event still in memory."""
+        return self.total - self._count
+
+    def _room(self) -> int:
+        """Free places before unwritten events would be overwritten (spilling if needed)."""
+        if self.path is None:
+            return self.capacity
+        if self.total - self._written == self.capacity:
+            self.flush()
+        return self.capacity - (self.total - self._written)
+
+    def emit(self, kind: int, subject: int, other: int = NONE) -> None:
+        """Append one event stamped with the current year."""
+        if self.path is not None:
+            self._room()
+        head = self._head
+        self.years[head] = self.year
+        self.kinds[head] = kind
+        self.subjects[head] = subject
+        self.others[head] = other
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total += 1
+
+    def emit_many(self, kind: int, subjects: Iterable[int], others: Optional[Iterable[int]] = None) -> None:
+        """Append events of one kind for many subjects at once."""
+        subjects = np.asarray(subjects, dtype=np.int64).reshape(-1)
+        others = np.full(len(subjects), NONE, dtype=np.int64) if others is None else np.asarray(others, dtype=np.int64)
+        start = 0
+        while start < len(subjects):
+            head = self._head
+            size = min(self._room(), self.capacity - head, len(subjects) - start)
+            self.years[head:head + size] = self.year
+            self.kinds[head:head + size] = kind
+            self.subjects[head:head + size] = subjects[start:start + size]
+            self.others[head:head + size] = others[start:start + size]
+            self._head = (head + size) % self.capacity
+            self._count = min(self._count + size, self.capacity)
+            self.total += size
+            start += size
+
+    def since(self, sequence: int) -> np.ndarray:
+        """
+        Return events from sequence number on, oldest first.
+
+        Args:
+            sequence (int): Sequence number of the first event (e.g. a previous total)
+
+        Returns:
+            np.ndarray: Structured array of EVENT_DTYPE (a copy)
+
+        Raises:
+            ValueError: If some of the events were already overwritten
+        """
+        oldest = self.oldest
+        if sequence < oldest:
+            raise ValueError(f"Events {sequence}..{oldest - 1} are no longer in memory")
+        count = self.total - sequence
+        positions = (self._head - count + np.arange(count)) % self.capacity
+        records = np.empty(count, dtype=EVENT_DTYPE)
+        records['year'] = self.years[positions]
+        records['kind'] = self.kinds[positions]
+        records['subject'] = self.subjects[positions]
+        records['other'] = self.others[positions]
+        return records
+
+    def flush(self) -> None:
+        """Append events emitted since the last flush to the file."""
+        if self.path is None or self._written == self.total:
+            return
+        with open(self.path, "ab") as file:
+            file.write(self.since(self._written).tobytes())
+        self._written = self.total
+
+    @classmethod
+    def from_records(cls, records: np.ndarray, total: int, year: int,
+                     capacity: int = 1 << 20, path: Optional[str] = None) -> "EventLog":
+        """
+        Create log holding given (latest) events, e.g. restored from a checkpoint.
+
+        Args:
+            records (np.ndarray): Events of EVENT_DTYPE, oldest first
+            total (int): Number of events emitted before, including records
+            year (int): Current year
+            capacity (int): Number of events kept in memory
+            path (Optional[str]): File for events emitted from now on
+        """
+        log = cls(capacity, path)
+        records = records[-capacity:]
+        count = len(records)
+        log.years[:count] = records['year']
+        log.kinds[:count] = records['kind']
+        log.subjects[:count] = records['subject']
+        log.others[:count] = records['other']
+        log._head = count % capacity
+        log._count = count
+        log.total = log._written = total
+        log.year = year
+        return log
+
+
+def read_events(path: str) -> np.ndarray:
+    """Memory-map events written by EventLog to path."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode='r')
+
+
+def _deltas(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """Change of population, families and tribes caused by every event."""
+    kind = records['kind']
+    widowed = (kind == EventKind.DEATH) & (records['other'] != NONE)
+    return {
+        'population': ((kind == EventKind.ADDED) | (kind == EventKind.BIRTH)).astype(np.int64)
+                      - (kind == EventKind.DEATH),
+        'families': (kind == EventKind.MARRIAGE).astype(np.int64) - widowed,
+        'tribes': (kind == EventKind.TRIBE_FORMED).astype(np.int64)
+                  - (kind == EventKind.TRIBE_MERGED) - (kind == EventKind.TRIBE_DISSOLVED),
+    }
+
+
+class EventStats:
+    """
+    Population, family and tribe counts kept up to date from an EventLog.
+
+    Attributes:
+        population (int): Number of living humans
+        families (int): Number of married couples
+        tribes (int): Number of tribes
+        last_year (dict[EventKind, int]): Number of events of every kind in the last update
+        cursor (int): Sequence number of the next event to read
+    """
+
+    def __init__(self, population: int = 0, families: int = 0, tribes: int = 0, cursor: int = 0) -> None:
+        self.population: int = population
+        self.families: int = families
+        self.tribes: int = tribes
+        self.cursor: int = cursor
+        self.last_year: Dict[EventKind, int] = {kind: 0 for kind in EventKind}
+
+    @classmethod
+    def of(cls, humanity: Any) -> "EventStats":
+        """Counters matching the current state of humanity, reading its events from now on."""
+        return cls(len(humanity.humans), humanity.family_count(), len(humanity.tribe_registry),
+                   humanity.events.total)
+
+    def consume(self, records: np.ndarray) -> None:
+        """Apply events to the counters."""
+        deltas = _deltas(records)
+        self.population += int(deltas['population'].sum())
+        self.families += int(deltas['families'].sum())
+        self.tribes += int(deltas['tribes'].sum())
+        counts = np.bincount(records['kind'], minlength=len(EventKind))
+        self.last_year = {kind: int(counts[kind]) for kind in EventKind}
+
+    def update(self, log: EventLog) -> None:
+        """Apply events emitted into log since the last update."""
+        self.consume(log.since(self.cursor))
+        self.cursor = log.total
+
+
+def yearly_summary(records: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Rebuild yearly series of a run from its events (e.g. read_events of a log file).
+
+    Totals are counted from the first event, so the log should start with
+    the creation of the population.
+
+    Args:
+        records (np.ndarray): Events of EVENT_DTYPE, oldest first
+
+    Returns:
+        dict[str, np.ndarray]: 'year', end-of-year 'population', 'families'
+        and 'tribes', and the number of events of every kind per year
+        (keys are lower-case kind names, e.g. 'birth')
+    """
+    if not len(records):
+        return {'year': np.zeros(0, dtype=np.int64)}
+    years = records['year'].astype(np.int64)
+    first = int(years.min())
+    index = years - first
+    length = int(index.max()) + 1
+    summary: Dict[str, np.ndarray] = {'year': np.arange(first, first + length)}
+    for name, delta in _deltas(records).items():
+        summary[name] = np.cumsum(np.bincount(index, weights=delta, minlength=length)).astype(np.int64)
+    for kind in EventKind:
+        summary[kind.name.lower()] = np.bincount(index[records['kind'] == kind], minlength=length)
+    return summary
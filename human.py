@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Union
-import uuid
-from data.plan.system import MedievalTaskManager
+from typing import Any, Callable, List, Optional, Tuple, Union
+from data.plan.system import default_manager
 from data.job import JOB_TO_HOUR
+from inventory import Inventory
 import random
 
 
@@ -22,25 +22,104 @@ Przykład użycia:
 """
 
 
-@dataclass
+class _WorldField:
+    """
+    Human attribute stored in its own slot or, once the human joins
+    a Humanity, in one of its column arrays (row = position of the human).
+    """
+
+    def __init__(self, slot: Any, column: str, default: Any, index: Optional[int] = None) -> None:
+        self.slot = slot
+        self.column = column
+        self.default = default
+        self.index = index
+
+    def __get__(self, obj: Optional["Human"], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self.default
+        world = obj._world
+        if world is None:
+            try:
+                return self.slot.__get__(obj, objtype)
+            except AttributeError:
+                return self.default
+        if self.index is None:
+            return getattr(world, self.column)[obj._row].item()
+        return getattr(world, self.column)[obj._row, self.index].item()
+
+    def __set__(self, obj: "Human", value: Any) -> None:
+        world = obj._world
+        if world is None:
+            self.slot.__set__(obj, value)
+        elif self.index is None:
+            getattr(world, self.column)[obj._row] = value
+        else:
+            getattr(world, self.column)[obj._row, self.index] = value
+
+
+class _LazyField:
+    """
+    Slot holding None (or left unset) until the attribute is first read,
+    when the value is created by factory (e.g. an empty dict that most
+    humans never use).
+    """
+
+    def __init__(self, slot: Any, factory: Callable[[], Any]) -> None:
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return None
+        value = self.peek(obj)
+        if value is None:
+            value = self.factory()
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+    def peek(self, obj: Any) -> Any:
+        """Return the value, or None if it was not created yet (without creating it)."""
+        try:
+            return self.slot.__get__(obj)
+        except AttributeError:
+            return None
+
+
+@dataclass(slots=True)
 class HumanBody:
     x: int = 0
     y: int = 0
     health: int = 100
-    status: dict = field(default_factory=dict)
-    inventory: List = field(default_factory=list)
+    status: Optional[dict] = None
+    inventory: Optional[Inventory] = None
     alive: bool = True
 
     def distance(self, x: int, y: int) -> int:
         return abs(x - self.x) + abs(y - self.y)
 
+    def has_item(self, item: str) -> bool:
+        """Check for an item without allocating an inventory row for an empty-handed body."""
+        inventory = _body_inventory.peek(self)
+        return inventory is not None and item in inventory
 
-@dataclass
+    def release_inventory(self) -> None:
+        """Free the inventory row (e.g. when the body dies); a new empty one is made on next use."""
+        inventory = _body_inventory.peek(self)
+        if inventory is not None:
+            inventory.release()
+            self.inventory = None
+
+
+@dataclass(slots=True)
 class Human:
     """
     Klasa reprezentująca człowieka w systemie symulacji społecznej.
     
     Atrybuty:
+        id (int | None): Identyfikator nadawany przez Humanity (kolejne liczby całkowite)
         name (str): Imię i nazwisko osoby
         age (int): Wiek osoby
         gender (str): Płeć osoby
@@ -58,9 +137,13 @@ class Human:
         patience (float): Poziom cierpliwości - wpływa na długoterminowe działania
         honesty (float): Poziom uczciwości - wpływa na zaufanie innych
         adaptability (float): Poziom adaptacyjności - wpływa na radzenie sobie ze zmianami
+    
+    Klasa używa __slots__, a memory i future_plans są tworzone dopiero przy
+    pierwszym użyciu, więc pojedynczy człowiek zajmuje niewiele pamięci.
     """
-    mtm: MedievalTaskManager = MedievalTaskManager()
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    _world: Any = field(default=None, init=False, repr=False, compare=False)
+    _row: int = field(default=-1, init=False, repr=False, compare=False)
+    id: Optional[int] = None
     name: str = ""
     age: int = 10
     gender: str = "male"
@@ -76,20 +159,52 @@ class Human:
     patience: float = 0.0      
     honesty: float = 0.0        
     adaptability: float = 0.0
-    memory: dict = field(default_factory=dict)
-    future_plans: List = field(default_factory=list)
+    memory: Optional[dict] = field(default=None, repr=False)
+    future_plans: Optional[List] = field(default=None, repr=False)
     plan: str = ""
     
+    # Człowiek bez id (jeszcze nie dodany do Humanity) porównywany jest jak zwykły obiekt
     def __hash__(self) -> int:
+        if self.id is None:
+            return object.__hash__(self)
         return hash(self.id)
     
     def __eq__(self, other):
         if not isinstance(other, Human):
             return NotImplemented
+        if self.id is None or other.id is None:
+            return self is other
         return self.id == other.id
 
+    @classmethod
+    def _bound(cls,
+               world: Any,
+               row: int,
+               id: Optional[int] = None,
+               name: str = "",
+               gender: str = "male",
+               job: str = "worker",
+               plan: str = "") -> "Human":
+        """
+        Create human already bound to a row of world, skipping __init__.
+
+        Used by Humanity.create_humans and checkpoints - attributes kept in
+        world's arrays are not written one by one, memory and future_plans
+        stay unset until first read. Defaults are the same as of the fields.
+        """
+        human = cls.__new__(cls)
+        human._world = world
+        human._row = row
+        human.id = id
+        human.name = name
+        human.gender = gender
+        human.job = job
+        human.plan = plan
+        return human
+
     def _find_plan(self) -> List:
-        return self.mtm.create_daily_plan(self.job, JOB_TO_HOUR[self.job])
+        manager = self._world.plans if self._world is not None else default_manager
+        return manager.create_daily_plan(self.job, JOB_TO_HOUR[self.job])
     
     def _set_plan(self) -> None:
         self.plan = self.future_plans.pop(0)
@@ -107,6 +222,30 @@ class Human:
         
         
     
+# Cechy charakteru - kolejność kolumn w macierzy Humanity.traits
+TRAITS: Tuple[str, ...] = (
+    'intelligence', 'charisma', 'empathy', 'courage',
+    'ambition', 'loyalty', 'creativity', 'patience',
+    'honesty', 'adaptability'
+)
+
+# Atrybuty przechowywane w tablicach Humanity (kolumnowo) po dodaniu człowieka
+# (slot zostaje i przechowuje wartość, gdy człowiek nie należy do Humanity)
+Human.age = _WorldField(Human.age, "ages", 10)
+for _index, _trait in enumerate(TRAITS):
+    setattr(Human, _trait, _WorldField(getattr(Human, _trait), "traits", 0.0, index=_index))
+WORLD_FIELDS: Tuple[str, ...] = ("age",) + TRAITS
+
+# Pola tworzone leniwie, przy pierwszym odczycie
+Human.memory = _LazyField(Human.memory, dict)
+Human.future_plans = _LazyField(Human.future_plans, list)
+LAZY_FIELDS: Tuple[str, ...] = ("memory", "future_plans")
+HumanBody.status = _LazyField(HumanBody.status, dict)
+# Wiersz w InventoryStore zajmowany dopiero przy pierwszym użyciu ekwipunku
+_body_inventory = _LazyField(HumanBody.inventory, Inventory)
+HumanBody.inventory = _body_inventory
+
+
 # class HumanMenager:
 #     def __init__(self):
 #         self.body: HumanBody = HumanBody()
@@ -176,9 +315,13 @@ class Actions:
     - Tasks require specific items and give specific rewards
     - Time requirements vary by task complexity
     """
-    def __init__(self, body, mind) -> None:
+    def __init__(self, body, mind, rng: Optional[random.Random] = None) -> None:
         self.body: HumanBody = body
         self.mind: Human = mind
+        # Strumień 'plans' świata człowieka, jeśli nie podano innego
+        if rng is None:
+            rng = mind._world.streams.random("plans") if mind._world is not None else random
+        self.rng = rng
         self.mind.plan_menagment()
         self.action = self.mind.plan
 
@@ -186,11 +329,11 @@ class Actions:
 
 
     def prayer(self) -> Optional[Tuple[int, int, Optional[Union[List, bool]]]]:
-        if "praing book" not in self.body.inventory:
+        if not self.body.has_item("prayer book"):
             return None
         if "praying" not in self.mind.memory:
             x, y = self.body.x, self.body.y
-            radius = (random.randint(-50, 50), random.randint(-50, 50))
+            radius = (self.rng.randint(-50, 50), self.rng.randint(-50, 50))
             self.mind.memory["praying"] = (x + radius[0], y + radius[1])
             pass
     
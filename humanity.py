@@ -8,8 +8,12 @@ and tribal relationships. It manages human creation, family formation, and triba
 Key Features:
 - Human creation with random traits
 - Family formation and growth
-- Tribal organization and management
+- Tribal organization and management with incrementally updated aggregates
 - Relationship tracking using graph structure
+- Genealogy index (parents, generations, ancestor sets) for kinship
+  checks; close relatives are not matched into families
+- Typed, directed relations (several per pair) with per-relation adjacency
+  for O(1) relationship checks
 
 Example Usage:
 -------------
@@ -23,6 +27,11 @@ Creating Humans:
 >>> len(world.humans)
 1
 
+Creating Many Humans At Once:
+>>> people = world.create_humans(1000)  # vectorized traits, ages and names
+>>> len(world.humans)
+1001
+
 Creating Families:
 >>> # Create multiple humans first
 >>> for _ in range(10):
@@ -98,26 +107,65 @@ LEADER_MIN_AGE: int = 25
 Dependencies:
 ------------
 - networkx
-- random
+- numpy
+- relations (internal module)
+- lineage (internal module)
+- leadership (internal module)
+- tribe (internal module)
+- rng (internal module)
+- events (internal module)
 - typing
+- uuid
 - data.names (internal module)
+- data.plan.system (internal module)
 - human (internal module)
 
 Notes:
 ------
 - All character traits are normalized between 0.0 and 1.0
-- Tribal leadership is based on charisma, courage, and intelligence
-- Family relations are bidirectional in the graph structure
+- Humans are identified by consecutive integer ids given out by Humanity;
+  uuid strings are generated only on export (export_uuid)
+- Tribal leadership is based on charisma, courage, and intelligence; the
+  best candidates are kept in lazily invalidated heaps (one per tribe and
+  one for humans without a tribe). After changing traits of humans directly
+  in the traits matrix, call reset_candidates()
+- Relations are directed: 'leader' (leader -> member), 'member'
+  (member -> leader), 'father'/'mother' (parent -> child); 'spouse' is
+  stored in both directions
+- The whole state can be saved and restored with checkpoint.save_checkpoint /
+  load_checkpoint
+- graph is built from the relation indexes only when read (and cached until
+  the next change), so it is a snapshot for drawing and analysis
+- Relations must be changed through Humanity methods so that the indexes,
+  pools and tribes stay in sync; humans are removed only with remove_human(s),
+  which also cleans the graph, pools and tribes (order of humans may change)
 - Names are generated using medieval Polish and European name patterns
+- All draws come from named streams of self.streams (demography, names,
+  plans), never from the module-level random, so a seed reproduces a run
+- Every birth, death, marriage, change of tribes and leader change is
+  emitted to self.events; statistics can be derived from the stream
+  (events.EventStats) instead of scanning the graph every year
 """
 
 
 import networkx as nx
-from human import Human
+import numpy as np
+from human import Human, WORLD_FIELDS, TRAITS
 import data.names
-import random
+import uuid
+from data.plan.system import MedievalTaskManager
 from name_generator import generate_tribe_name
-from typing import Optional, Dict, List, Any
+from relations import RelationStore, gc_paused
+from pools import IdPool
+from tribe import Tribe
+from lineage import Genealogy
+from leadership import CandidateHeap
+from rng import RandomStreams
+from events import EventKind, EventLog, NONE
+from typing import Optional, Dict, List, Any, Set, Iterable, Tuple
+
+# Cechy, których suma decyduje o przywództwie
+LEADERSHIP_TRAITS = ('charisma', 'courage', 'intelligence')
 
 
 class Humanity:
@@ -128,19 +176,292 @@ class Humanity:
         PARENTS_AGE (int): Minimum age required to become a parent
         MIN_TRIBE_SIZE (int): Minimum number of members in a tribe
         LEADER_MIN_AGE (int): Minimum age required to become a tribe leader
-        graph (nx.Graph): Graph representing relationships between humans
+        LEADER_MIN_CHARISMA (float): Minimum charisma required to become a tribe leader
+        KIN_DEPTH (int): Humans sharing an ancestor this many generations back do not marry
+        MATCH_ATTEMPTS (int): Partners tried when matching a couple
+        relations (RelationStore): Typed relations with per-relation adjacency
+        lineage (Genealogy): Parents, generations and ancestor sets for kinship checks
+        graph (nx.MultiDiGraph): Graph of relations between humans (edge key = relation)
         humans (list): List of all humans in simulation
+        next_id (int): Next free integer id given out by allocate_ids
+        uuids (dict): Human id -> uuid string, generated on first export
+        unmarried (dict): Gender -> IdPool of unmarried adults (age >= PARENTS_AGE)
+        ages (np.ndarray): Age of every human, indexed by position in humans
+        traits (np.ndarray): (N, 10) float32 matrix of character traits (columns as human.TRAITS)
+        tribe_registry (dict): Leader -> Tribe with running trait sums
+        version (int): Counter increased on every change of tribes
+        streams (RandomStreams): Named random streams of this world
+        rng (np.random.Generator): 'demography' stream, for batch draws
+        random (random.Random): 'demography' stream, for scalar draws
+        name_rng (np.random.Generator): 'names' stream, for batch draws
+        name_random (random.Random): 'names' stream, for scalar draws
+        plans (MedievalTaskManager): Daily plans of humans, drawn from the 'plans' stream
+        events (EventLog): Append-only log of births, deaths, marriages and tribe changes
     """
     
     PARENTS_AGE: int = 16
     MIN_TRIBE_SIZE: int = 5
     LEADER_MIN_AGE: int = 25
+    LEADER_MIN_CHARISMA: float = 0.6
+    MORTALITY_AGE: int = 60
+    MORTALITY_SCALE: float = 200.0
+    KIN_DEPTH: int = 2
+    MATCH_ATTEMPTS: int = 5
 
-    def __init__(self) -> None:
-        """Initialize a new instance of community simulation."""
-        self.graph: nx.Graph = nx.Graph()
+    def __init__(self, seed: Optional[int] = None, streams: Optional[RandomStreams] = None) -> None:
+        """
+        Initialize a new instance of community simulation.
+        
+        Args:
+            seed (Optional[int]): Seed of the random streams (ignored if streams are given)
+            streams (Optional[RandomStreams]): Random streams to draw from
+        """
+        self.streams: RandomStreams = streams if streams is not None else RandomStreams(seed)
+        self.rng: np.random.Generator = self.streams.generator("demography")
+        self.random = self.streams.random("demography")
+        self.name_rng: np.random.Generator = self.streams.generator("names")
+        self.name_random = self.streams.random("names")
+        self.plans: MedievalTaskManager = MedievalTaskManager(self.streams.random("plans"))
+        self.ages: np.ndarray = np.zeros(64, dtype=np.int32)
+        self.traits: np.ndarray = np.zeros((64, len(TRAITS)), dtype=np.float32)
+        self.relations: RelationStore = RelationStore(symmetric=("spouse",))
+        self.lineage: Genealogy = Genealogy()
         self.humans: List[Human] = []
-        self.tribes: List[Dict[str, Any]] = []
+        self.next_id: int = 0
+        self.uuids: Dict[int, str] = {}
+        self.tribe_registry: Dict[Human, Tribe] = {}
+        self._tribe_candidates: Dict[Human, CandidateHeap[Human]] = {}
+        self._free_candidates: Optional[CandidateHeap[Human]] = None
+        self._leadership_columns: List[int] = [TRAITS.index(t) for t in LEADERSHIP_TRAITS]
+        self.version: int = 0
+        self._tribes_snapshot: Optional[List[Dict[str, Any]]] = None
+        self._tribes_snapshot_version: int = -1
+        self.unmarried: Dict[str, IdPool[Human]] = {"male": IdPool(), "female": IdPool()}
+        self.events: EventLog = EventLog()
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        return self.relations.graph
+
+    def _reserve(self, count: int) -> None:
+        """Grow column arrays so that count more humans fit in them."""
+        needed = len(self.humans) + count
+        capacity = len(self.ages)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        ages = np.zeros(capacity, dtype=self.ages.dtype)
+        traits = np.zeros((capacity, len(TRAITS)), dtype=self.traits.dtype)
+        ages[:len(self.humans)] = self.ages[:len(self.humans)]
+        traits[:len(self.humans)] = self.traits[:len(self.humans)]
+        self.ages, self.traits = ages, traits
+
+    def allocate_ids(self, count: int = 1) -> range:
+        """Reserve count consecutive integer ids for new humans."""
+        ids = range(self.next_id, self.next_id + count)
+        self.next_id += count
+        return ids
+
+    def export_uuid(self, human: Human) -> str:
+        """
+        Return a stable uuid string of human for use outside the simulation.
+        
+        Humans are identified by integer ids; uuids are generated only for
+        humans that are actually exported (e.g. saved or sent elsewhere).
+        """
+        value = self.uuids.get(human.id)
+        if value is None:
+            value = self.uuids[human.id] = str(uuid.uuid4())
+        return value
+
+    def _add_human(self, human: Human, traits: Optional[np.ndarray] = None) -> None:
+        """
+        Append human to simulation, moving its columnar attributes into arrays.
+        
+        Human without an id gets the next one from allocate_ids, so it must
+        not be kept in sets or dicts before being added.
+        
+        Args:
+            human (Human): Human not yet added to any simulation
+            traits (Optional[np.ndarray]): Trait row to use instead of human's own values
+        """
+        if human.id is None:
+            human.id = self.allocate_ids(1)[0]
+        self._reserve(1)
+        row = len(self.humans)
+        values = [getattr(human, name) for name in WORLD_FIELDS]
+        human._world = self
+        human._row = row
+        for name, value in zip(WORLD_FIELDS, values):
+            setattr(human, name, value)
+        if traits is not None:
+            self.traits[row] = traits
+        
+        self.humans.append(human)
+        self.relations.add_node(human, role="human")
+        self._push_free([human])
+        if self._is_available_parent(human):
+            self.unmarried[human.gender].add(human)
+
+    def _is_available_parent(self, human: Human) -> bool:
+        return human.age >= self.PARENTS_AGE and not self.relations.successors(human, 'spouse')
+
+    def _link_member(self, leader: Human, member: Human) -> None:
+        self.relations.add(leader, member, 'leader')
+        self.relations.add(member, leader, 'member')
+
+    def _unlink_member(self, leader: Human, member: Human) -> None:
+        self.relations.remove(leader, member, 'leader')
+        self.relations.remove(member, leader, 'member')
+
+    def _join_tribe(self, leader: Human, member: Human) -> None:
+        self.version += 1
+        self._link_member(leader, member)
+        self.tribe_registry[leader].add(member, self.traits[member._row])
+        if self._is_candidate(member):
+            self._tribe_candidates.setdefault(leader, CandidateHeap()).push(
+                member, self.leadership_score(member))
+
+    def _leave_tribe(self, member: Human) -> None:
+        self.version += 1
+        leader = self.relations.first(member, 'member')
+        self._unlink_member(leader, member)
+        tribe = self.tribe_registry[leader]
+        tribe.remove(member, self.traits[member._row])
+        if not tribe.members:
+            del self.tribe_registry[leader]
+            self._tribe_candidates.pop(leader, None)
+            self.events.emit(EventKind.TRIBE_DISSOLVED, leader.id)
+
+    def leadership_score(self, human: Human) -> float:
+        """Return leadership score of human (charisma + courage + intelligence)."""
+        return float(self.traits[human._row, self._leadership_columns].sum())
+
+    def _is_candidate(self, human: Human) -> bool:
+        """Check if human may become a leader (age and charisma)."""
+        return (human.age >= self.LEADER_MIN_AGE
+                and self.traits[human._row, self.trait_index('charisma')] >= self.LEADER_MIN_CHARISMA)
+
+    def _candidate_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Return rows (from given ones) of humans who may become leaders."""
+        charisma = self.traits[rows, self.trait_index('charisma')]
+        return rows[(self.ages[rows] >= self.LEADER_MIN_AGE) & (charisma >= self.LEADER_MIN_CHARISMA)]
+
+    def _is_free(self, human: Human) -> bool:
+        return (human._world is self and human not in self.tribe_registry
+                and self.relations.first(human, 'member') is None)
+
+    def _free_heap(self) -> CandidateHeap[Human]:
+        """Heap of candidates without a tribe, built from the arrays when needed."""
+        heap = self._free_candidates
+        if heap is None or len(heap) > 2 * len(self.humans) + 64:
+            count = len(self.humans)
+            free = np.ones(count, dtype=np.bool_)
+            free[self.rows_of(self.relations.sources('leader'))] = False
+            free[self.rows_of(self.relations.sources('member'))] = False
+            rows = self._candidate_rows(np.flatnonzero(free))
+            scores = self.traits[rows][:, self._leadership_columns].sum(axis=1)
+            heap = self._free_candidates = CandidateHeap(
+                zip([self.humans[row] for row in rows.tolist()], scores.tolist()))
+        return heap
+
+    def _push_free(self, humans: Iterable[Human]) -> None:
+        """Add humans who just left a tribe to the heap of free candidates."""
+        if self._free_candidates is None:
+            return
+        for human in humans:
+            if human._world is self and self._is_candidate(human):
+                self._free_candidates.push(human, self.leadership_score(human))
+
+    def reset_candidates(self) -> None:
+        """
+        Rebuild leadership heaps; needed after traits were changed directly
+        in the traits matrix for humans already in tribes.
+        """
+        self._free_candidates = None
+        self._tribe_candidates = {}
+        for leader, tribe in self.tribe_registry.items():
+            rows = self._candidate_rows(self.rows_of(tribe.members))
+            scores = self.traits[rows][:, self._leadership_columns].sum(axis=1)
+            self._tribe_candidates[leader] = CandidateHeap(
+                zip([self.humans[row] for row in rows.tolist()], scores.tolist()))
+
+    def best_free_leader(self) -> Optional[Human]:
+        """Return the best candidate for a leader among humans without a tribe."""
+        return self._free_heap().best(self._is_free)
+
+    def best_successor(self, leader: Human, exclude: Iterable[Human] = ()) -> Optional[Human]:
+        """
+        Return the best member of leader's tribe to take over the tribe.
+        
+        Args:
+            leader (Human): Current tribe leader
+            exclude (Iterable[Human]): Members that cannot take over (e.g. dying)
+            
+        Returns:
+            Optional[Human]: Member with the highest leadership score or None
+        """
+        heap = self._tribe_candidates.get(leader)
+        if heap is None:
+            return None
+        tribe = self.tribe_registry[leader]
+        if len(heap) > 2 * len(tribe) + 16:
+            heap.compact(lambda human: human in tribe.members)
+        exclude = exclude if isinstance(exclude, (set, frozenset, dict)) else set(exclude)
+        return heap.best(lambda human: human in tribe.members, exclude)
+
+    def trait_index(self, trait: str) -> int:
+        """Return column of trait in the traits matrix."""
+        return TRAITS.index(trait)
+
+    def rows_of(self, humans: Iterable[Human]) -> np.ndarray:
+        """Return rows of humans in the column arrays."""
+        return np.fromiter((human._row for human in humans), dtype=np.intp)
+
+    def trait_mean(self, humans: Iterable[Human], trait: str) -> float:
+        """
+        Compute mean value of a trait over a group of humans.
+        
+        Args:
+            humans (Iterable[Human]): Group of humans (e.g. tribe members)
+            trait (str): Trait name
+            
+        Returns:
+            float: Mean trait value (0.0 for empty group)
+        """
+        rows = self.rows_of(humans)
+        if not len(rows):
+            return 0.0
+        return float(self.traits[rows, self.trait_index(trait)].mean())
+
+    def get_spouse(self, human: Human) -> Optional[Human]:
+        """Return spouse of human or None."""
+        return self.relations.first(human, 'spouse')
+
+    def get_leader(self, human: Human) -> Optional[Human]:
+        """Return leader of the tribe human belongs to or None."""
+        return self.relations.first(human, 'member')
+
+    def is_leader(self, human: Human) -> bool:
+        """Check if human leads a tribe."""
+        return human in self.tribe_registry
+
+    def get_tribe(self, leader: Human) -> Optional[Tribe]:
+        """Return Tribe led by leader or None."""
+        return self.tribe_registry.get(leader)
+
+    def get_parents(self, human: Human) -> Set[Human]:
+        """Return parents of human."""
+        return set(self.relations.predecessors(human, 'father')) | self.relations.predecessors(human, 'mother')
+
+    def get_children(self, human: Human) -> Set[Human]:
+        """Return children of human."""
+        return set(self.relations.successors(human, 'father')) | self.relations.successors(human, 'mother')
+
+    def family_count(self) -> int:
+        """Return number of married couples."""
+        return self.relations.count('spouse')
 
     def generate_name(self, gender: str) -> Optional[str]:
         """
@@ -153,18 +474,118 @@ class Humanity:
             Optional[str]: Generated name with title or None if error
         """
         if gender in data.names.MEDIEVAL_NAMES_TITLES:
-            name = random.choice(data.names.MEDIEVAL_NAMES[gender])
-            add_title = random.choice(data.names.MEDIEVAL_DESCRIPTORS_TITLES)
+            rng = self.name_random
+            name = rng.choice(data.names.MEDIEVAL_NAMES[gender])
+            add_title = rng.choice(data.names.MEDIEVAL_DESCRIPTORS_TITLES)
             
             if gender == "female" and add_title in ["personality", "appearance"]:
-                title = random.choice(data.names.MEDIEVAL_DESCRIPTORS[add_title])
+                title = rng.choice(data.names.MEDIEVAL_DESCRIPTORS[add_title])
                 title = title[:-1] + "a"
                 return f"{name} {title}"
             
-            title = random.choice(data.names.MEDIEVAL_DESCRIPTORS[add_title])
+            title = rng.choice(data.names.MEDIEVAL_DESCRIPTORS[add_title])
             return f"{name} {title}"
         return None
 
+    def generate_names(self, genders: np.ndarray) -> List[str]:
+        """
+        Generate names with titles for many humans at once.
+        
+        Draws the same distribution as generate_name, but with one batch of
+        random numbers per gender instead of four calls per name.
+        
+        Args:
+            genders (np.ndarray): Gender of every human ('male' or 'female')
+            
+        Returns:
+            List[str]: Generated names, in order of genders
+        """
+        genders = np.asarray(genders)
+        names = np.empty(len(genders), dtype=object)
+        categories = data.names.MEDIEVAL_DESCRIPTORS_TITLES
+        sizes = np.array([len(data.names.MEDIEVAL_DESCRIPTORS[c]) for c in categories])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        
+        for gender in data.names.MEDIEVAL_NAMES_TITLES:
+            rows = np.flatnonzero(genders == gender)
+            if not len(rows):
+                continue
+            first_names = data.names.MEDIEVAL_NAMES[gender]
+            titles = [
+                title[:-1] + "a" if gender == "female" and category in ["personality", "appearance"] else title
+                for category in categories
+                for title in data.names.MEDIEVAL_DESCRIPTORS[category]
+            ]
+            
+            rng = self.name_rng
+            category = rng.integers(len(categories), size=len(rows))
+            title_index = offsets[category] + (rng.random(len(rows)) * sizes[category]).astype(np.intp)
+            name_index = rng.integers(len(first_names), size=len(rows))
+            names[rows] = [f"{first_names[n]} {titles[t]}"
+                           for n, t in zip(name_index.tolist(), title_index.tolist())]
+        
+        return names.tolist()
+
+    def create_humans(self,
+                      count: int,
+                      gender: Optional[str] = None,
+                      ages: Optional[Any] = None) -> List[Human]:
+        """
+        Create many humans at once and add them to simulation.
+        
+        Genders, ages, traits and names are drawn in batches, the new rows
+        are written to the column arrays in one slice and the graph nodes
+        are added with a single call, so this is much faster than calling
+        create_human in a loop.
+        
+        Args:
+            count (int): Number of humans to create
+            gender (Optional[str]): Gender of all humans. Random if None
+            ages (Optional[int | np.ndarray]): Age of all humans or of each one. Random (10-90) if None
+            
+        Returns:
+            List[Human]: Created humans, in order of their rows
+            
+        Example:
+            >>> world = Humanity(seed=1)
+            >>> village = world.create_humans(3, ages=30)
+            >>> [human.age for human in village], [human.id for human in village]
+            ([30, 30, 30], [0, 1, 2])
+        """
+        if count <= 0:
+            return []
+        
+        if gender is None:
+            genders = np.array(["male", "female"], dtype=object)[self.rng.integers(2, size=count)]
+        else:
+            genders = np.full(count, gender, dtype=object)
+        names = self.generate_names(genders)
+        
+        self._reserve(count)
+        start = len(self.humans)
+        rows = slice(start, start + count)
+        self.ages[rows] = self.rng.integers(10, 91, size=count) if ages is None else ages
+        self.traits[rows] = self.rng.random((count, len(TRAITS)), dtype=np.float32)
+        
+        humans = []
+        for row, human_id, name, human_gender in zip(range(start, start + count),
+                                                      self.allocate_ids(count),
+                                                      names,
+                                                      genders.tolist()):
+            humans.append(Human._bound(self, row, id=human_id, name=name, gender=human_gender))
+        
+        self.humans.extend(humans)
+        self.relations.add_nodes_from(humans, role="human")
+        self.events.emit_many(EventKind.ADDED, [human.id for human in humans])
+        self._free_candidates = None  # cechy mogą być jeszcze zmieniane - kopiec zbudowany przy potrzebie
+        
+        adults = self.ages[rows] >= self.PARENTS_AGE
+        for human, adult in zip(humans, adults.tolist()):
+            if adult:
+                self.unmarried[human.gender].add(human)
+        
+        return humans
+
     def create_human(self, 
                 gender: Optional[str] = None, 
                 name: Optional[str] = None, 
@@ -187,7 +608,7 @@ class Humanity:
             Created: Mieszko Waleczny, Age: 25
         """
         try:
-            human_gender = random.choice(["male", "female"]) if gender is None else gender
+            human_gender = self.random.choice(["male", "female"]) if gender is None else gender
             human_name = self.generate_name(human_gender) if name is None else name
             
             if human_name is None:
@@ -196,21 +617,12 @@ class Humanity:
             human = Human()
             human.name = str(human_name)
             human.gender = str(human_gender)
-            human.age = random.randint(10, 90) if age is None else age
+            human.age = self.random.randint(10, 90) if age is None else age
             human.job = "worker"
             
-            # Initialize character traits
-            traits = [
-                'intelligence', 'charisma', 'empathy', 'courage',
-                'ambition', 'loyalty', 'creativity', 'patience',
-                'honesty', 'adaptability'
-            ]
-            
-            for trait in traits:
-                setattr(human, trait, random.random())
-
-            self.humans.append(human)
-            self.graph.add_node(human, role="human")
+            # Initialize character traits - one block of random values
+            self._add_human(human, traits=self.rng.random(len(TRAITS), dtype=np.float32))
+            self.events.emit(EventKind.ADDED, human.id)
             
             return human
             
@@ -218,6 +630,31 @@ class Humanity:
             # In a production environment, you might want to log this error
             return None
 
+    def _pop_couple(self) -> Optional[Tuple[Human, Human]]:
+        """
+        Take a random unmarried man and woman who are not close kin out of the pools.
+        
+        Returns:
+            Optional[Tuple[Human, Human]]: (father, mother) or None if no match was found
+        """
+        males = self.unmarried["male"]
+        females = self.unmarried["female"]
+        if not males or not females:
+            return None
+        
+        father = males.pop_random(self.random)
+        for _ in range(self.MATCH_ATTEMPTS):
+            mother = females.choice(self.random)
+            if not self.lineage.are_close_kin(father.id, mother.id, self.KIN_DEPTH):
+                females.discard(mother)
+                return father, mother
+        males.add(father)
+        return None
+
+    def _marry(self, father: Human, mother: Human) -> None:
+        self.relations.add(father, mother, "spouse")
+        self.events.emit(EventKind.MARRIAGE, father.id, mother.id)
+
     def create_family(self) -> Optional[Dict[str, Human]]:
         """
         Create a new family by connecting two available humans.
@@ -225,28 +662,63 @@ class Humanity:
         Returns:
             Optional[Dict[str, Human]]: Dictionary with parents or None if cannot create
         """
-        potential_parents = [
-            human for human in self.humans 
-            if human.age >= self.PARENTS_AGE
-        ]
+        couple = self._pop_couple()
+        if couple is None:
+            return None
         
-        available_parents = [
-            h for h in potential_parents 
-            if not any(data.get('relation') == 'spouse' 
-                    for _, _, data in self.graph.edges(h, data=True))
-        ]
+        father, mother = couple
+        self._marry(father, mother)
+        return {"father": father, "mother": mother}
+
+    def create_families(self, count: int) -> List[Dict[str, Human]]:
+        """
+        Create up to count new families at once.
         
-        males = [h for h in available_parents if h.gender == "male"]
-        females = [h for h in available_parents if h.gender == "female"]
+        All couples are drawn in one batch: distinct men and women are
+        sampled from the pools with the numpy generator, close kin are found
+        for all pairs at once from the lineage arrays, and men whose partner
+        was rejected get a fresh woman, up to MATCH_ATTEMPTS rounds. Matched
+        humans leave the pools and are married together.
         
-        if not males or not females:
-            return None
+        Args:
+            count (int): Number of families to create
+            
+        Returns:
+            List[Dict[str, Human]]: Created families (fewer if pools run out)
+        """
+        males = self.unmarried["male"]
+        females = self.unmarried["female"]
+        count = min(count, len(males), len(females))
+        if count <= 0:
+            return []
         
-        father = random.choice(males)
-        mother = random.choice(females)
+        husbands = self.rng.choice(len(males), count, replace=False)
+        wives = np.full(count, -1, dtype=np.int64)
+        free = np.ones(len(females), dtype=bool)
+        waiting = np.arange(count)
+        for _ in range(self.MATCH_ATTEMPTS):
+            available = np.flatnonzero(free)
+            if not len(waiting) or not len(available):
+                break
+            drawn = self.rng.choice(available, min(len(waiting), len(available)), replace=False)
+            trying = waiting[:len(drawn)]
+            kin = self.lineage.close_kin_many(males.ids[husbands[trying]], females.ids[drawn], self.KIN_DEPTH)
+            wives[trying[~kin]] = drawn[~kin]
+            free[drawn[~kin]] = False
+            # Odrzuceni próbują ponownie z inną kobietą
+            waiting = np.concatenate([trying[kin], waiting[len(drawn):]])
         
-        self.graph.add_edge(father, mother, relation="spouse")
-        return {"father": father, "mother": mother}
+        matched = wives >= 0
+        husbands, wives = husbands[matched], wives[matched]
+        fathers, mothers = males.at(husbands), females.at(wives)
+        father_ids, mother_ids = males.ids[husbands], females.ids[wives]
+        males.discard_at(husbands)
+        females.discard_at(wives)
+        
+        self.events.emit_many(EventKind.MARRIAGE, father_ids, mother_ids)
+        with gc_paused():
+            self.relations.add_many(fathers, mothers, "spouse")
+            return [{"father": father, "mother": mother} for father, mother in zip(fathers, mothers)]
 
     def grow_family(self, human: Human) -> Optional[Human]:
         """
@@ -258,15 +730,12 @@ class Humanity:
         Returns:
             Optional[Human]: Created child or None if cannot create
         """
-        spouse = next((
-            neighbor for neighbor, data in self.graph[human].items()
-            if data.get('relation') == 'spouse'
-        ), None)
+        spouse = self.get_spouse(human)
         
         if not spouse or human.age < self.PARENTS_AGE or spouse.age < self.PARENTS_AGE:
             return None
             
-        gender = random.choice(["male", "female"])
+        gender = self.random.choice(["male", "female"])
         name = self.generate_name(gender)
         
         if name is not None:
@@ -276,31 +745,42 @@ class Humanity:
             child.age = 0
             
             # Inherit traits with small variance
-            traits = [
-                'intelligence', 'charisma', 'empathy', 'courage',
-                'ambition', 'loyalty', 'creativity', 'patience',
-                'honesty', 'adaptability'
-            ]
-            
-            for trait in traits:
-                parent_avg = (getattr(human, trait) + getattr(spouse, trait)) / 2
-                value = parent_avg + random.uniform(-0.1, 0.1)
-                setattr(child, trait, max(0.0, min(1.0, value)))
-            
-            self.humans.append(child)
-            self.graph.add_node(child, role="human")
+            parent_avg = (self.traits[human._row] + self.traits[spouse._row]) / 2
+            variance = self.rng.uniform(-0.1, 0.1, len(TRAITS))
+            self._add_human(child, traits=np.clip(parent_avg + variance, 0.0, 1.0))
             
             # Add family relations
             parent_type = "father" if human.gender == "male" else "mother"
             spouse_type = "mother" if parent_type == "father" else "father"
             
-            self.graph.add_edge(human, child, relation=parent_type)
-            self.graph.add_edge(spouse, child, relation=spouse_type)
+            self.relations.add(human, child, parent_type)
+            self.relations.add(spouse, child, spouse_type)
+            father, mother = (human, spouse) if parent_type == "father" else (spouse, human)
+            self.lineage.add_birth(child.id, father.id, mother.id)
+            self.events.emit(EventKind.BIRTH, child.id, father.id)
             
             return child
         
         return None
 
+    def is_descendant(self, human: Human, ancestor: Human) -> bool:
+        """Check if human descends from ancestor (any number of generations)."""
+        return self.lineage.is_ancestor(ancestor.id, human.id)
+
+    def are_close_kin(self, first: Human, second: Human, depth: Optional[int] = None) -> bool:
+        """
+        Check if two humans are close relatives (descent or common ancestor).
+        
+        Args:
+            first (Human): First human
+            second (Human): Second human
+            depth (Optional[int]): Generations checked back. KIN_DEPTH if None
+            
+        Returns:
+            bool: True if they are kin within depth generations
+        """
+        return self.lineage.are_close_kin(first.id, second.id, self.KIN_DEPTH if depth is None else depth)
+
     def is_in_family(self, human: Human) -> bool:
         """
         Check if human is already in a family.
@@ -311,12 +791,16 @@ class Humanity:
         Returns:
             bool: True if human has family, False otherwise
         """
-        return any(data.get('relation') in ['spouse', 'father', 'mother'] 
-                for _, _, data in self.graph.edges(human, data=True))
+        relations = self.relations
+        return bool(relations.successors(human, 'spouse')
+                    or relations.successors(human, 'father')
+                    or relations.successors(human, 'mother')
+                    or relations.predecessors(human, 'father')
+                    or relations.predecessors(human, 'mother'))
 
     def create_tribe(self, name: str | None = None) -> Optional[Dict[str, Any]]:
         """
-        Create new tribe with random leader and add it to tribes list.
+        Create new tribe with random leader and add it to the tribe registry.
         
         Args:
             name (str | None): Optional tribe name
@@ -324,49 +808,31 @@ class Humanity:
         Returns:
             Dict[str, Any] | None: Dictionary with tribe info or None if cannot create
         """
-        potential_leaders = [
-            h for h in self.humans 
-            if (h.age >= self.LEADER_MIN_AGE 
-                and h.charisma >= 0.6
-                and not any(data.get('relation') in ['leader', 'member'] 
-                        for _, _, data in self.graph.edges(h, data=True)))
-        ]
-        
-        if not potential_leaders:
+        leader = self.best_free_leader()
+        if leader is None:
             return None
-            
-        leader = max(potential_leaders, 
-                    key=lambda h: h.charisma + h.courage + h.intelligence)
         
-        potential_members = [
-            h for h in self.humans 
-            if (not any(data.get('relation') in ['leader', 'member'] 
-                    for _, _, data in self.graph.edges(h, data=True))
-                and h != leader)
-        ]
+        count = len(self.humans)
+        free = np.ones(count, dtype=np.bool_)
+        free[self.rows_of(self.relations.sources('leader'))] = False
+        free[self.rows_of(self.relations.sources('member'))] = False
+        free[leader._row] = False
+        potential_members = np.flatnonzero(free)
         
         if len(potential_members) < self.MIN_TRIBE_SIZE:
             return None
         
-        tribe_size = random.randint(self.MIN_TRIBE_SIZE, len(potential_members))
-        members = random.sample(potential_members, tribe_size)
-        
-        tribe = {
-            'name': name or generate_tribe_name(),
-            'leader': leader,
-            'members': members,
-            'strength': sum(m.courage for m in members) / len(members),
-            'wisdom': sum(m.intelligence for m in members) / len(members)
-        }
+        tribe_size = self.random.randint(self.MIN_TRIBE_SIZE, len(potential_members))
+        member_rows = self.rng.choice(potential_members, tribe_size, replace=False)
+        members = [self.humans[row] for row in member_rows.tolist()]
         
+        tribe = Tribe(name or generate_tribe_name(self.name_random), leader)
+        self.tribe_registry[leader] = tribe
+        self.events.emit(EventKind.TRIBE_FORMED, leader.id)
         for member in members:
-            self.graph.add_edge(leader, member, relation='leader')
-            self.graph.add_edge(member, leader, relation='member')
-
-        # Add the new tribe to tribes list
-        self.tribes.append(tribe)
+            self._join_tribe(leader, member)
 
-        return tribe
+        return tribe.to_dict()
 
     def get_tribe_info(self, leader: Human) -> Optional[Dict[str, Any]]:
         """
@@ -378,29 +844,15 @@ class Humanity:
         Returns:
             Dict[str, Any] | None: Dictionary with tribe info or None if tribe doesn't exist
         """
-        if not any(data.get('relation') == 'leader' 
-                for _, _, data in self.graph.edges(leader, data=True)):
-            return None
-            
-        members = [
-            neighbor for neighbor, data in self.graph[leader].items()
-            if data.get('relation') == 'member'
-        ]
-        
-        if not members:
+        tribe = self.tribe_registry.get(leader)
+        if tribe is None:
             return None
             
-        return {
-            'leader': leader,
-            'members': members,
-            'size': len(members),
-            'strength': sum(m.courage for m in members) / len(members),
-            'wisdom': sum(m.intelligence for m in members) / len(members)
-        }
+        return tribe.to_dict()
 
     def merge_tribes(self, leader1: Human, leader2: Human) -> bool:
         """
-        Merge two tribes under stronger leader and update tribes list.
+        Merge two tribes under stronger leader.
         
         Args:
             leader1 (Human): First tribe leader
@@ -409,31 +861,14 @@ class Humanity:
         Returns:
             bool: True if tribes were merged successfully, False otherwise
         """
-        tribe1 = self.get_tribe_info(leader1)
-        tribe2 = self.get_tribe_info(leader2)
-        
-        if not tribe1 or not tribe2:
+        if leader1 == leader2 or not self.is_leader(leader1) or not self.is_leader(leader2):
             return False
             
         new_leader = leader1 if leader1.charisma > leader2.charisma else leader2
         old_leader = leader2 if new_leader == leader1 else leader1
         
         # Transfer members to new leader
-        for member, data in list(self.graph[old_leader].items()):
-            if data.get('relation') == 'member':
-                self.graph.remove_edge(old_leader, member)
-                self.graph.remove_edge(member, old_leader)
-                self.graph.add_edge(new_leader, member, relation='leader')
-                self.graph.add_edge(member, new_leader, relation='member')
-        
-        # Update tribes list
-        self.tribes = [t for t in self.tribes if t['leader'] != old_leader]
-        for tribe in self.tribes:
-            if tribe['leader'] == new_leader:
-                tribe['members'].extend([m for m in tribe2['members'] if m not in tribe['members']])
-                tribe['strength'] = sum(m.courage for m in tribe['members']) / len(tribe['members'])
-                tribe['wisdom'] = sum(m.intelligence for m in tribe['members']) / len(tribe['members'])
-                break
+        self._hand_over(old_leader, new_leader)
         
         return True
     
@@ -441,33 +876,183 @@ class Humanity:
         """
         Get list of all tribes in system.
         
+        The list is built from the tribe registry and cached until the next
+        change of tribes, so repeated calls within a year are free. It is
+        shared between callers and must not be modified.
+        
         Returns:
             List[Dict[str, Any]]: List of dictionaries with tribe information
         """
-        tribes = []
-        processed_leaders = set()
-        
-        for node in self.graph.nodes():
-            # Check if node is a leader
-            if any(data.get('relation') == 'leader' 
-                for _, _, data in self.graph.edges(node, data=True)):
-                if node in processed_leaders:
-                    continue
-                    
-                processed_leaders.add(node)
-                members = [
-                    neighbor for neighbor, data in self.graph[node].items()
-                    if data.get('relation') == 'member'
-                ]
-                
-                if members:
-                    tribe = {
-                        'name': f"Tribe of {node.name}",
-                        'leader': node,
-                        'members': members,
-                        'strength': sum(m.courage for m in members) / len(members),
-                        'wisdom': sum(m.intelligence for m in members) / len(members)
-                    }
-                    tribes.append(tribe)
-        
-        return tribes
\ No newline at end of file
+        if self._tribes_snapshot_version != self.version:
+            self._tribes_snapshot = [tribe.to_dict() for tribe in self.tribe_registry.values()]
+            self._tribes_snapshot_version = self.version
+        return self._tribes_snapshot
+
+    def _hand_over(self, old_leader: Human, new_leader: Human) -> None:
+        """Move tribe of old_leader under new_leader, merging with its tribe if any."""
+        self.version += 1
+        tribe = self.tribe_registry.pop(old_leader)
+        if new_leader in tribe.members:
+            self._unlink_member(old_leader, new_leader)
+            tribe.remove(new_leader, self.traits[new_leader._row])
+        
+        for member in tribe.members:
+            self._unlink_member(old_leader, member)
+            self._link_member(new_leader, member)
+        
+        tribe.leader = new_leader
+        candidates = self._tribe_candidates.pop(old_leader, CandidateHeap())
+        existing = self.tribe_registry.get(new_leader)
+        if existing is not None:
+            existing.absorb(tribe)
+            candidates = candidates.merge(self._tribe_candidates.get(new_leader, CandidateHeap()))
+            self._tribe_candidates[new_leader] = candidates
+            self.events.emit(EventKind.TRIBE_MERGED, new_leader.id, old_leader.id)
+        elif tribe.members:
+            self.tribe_registry[new_leader] = tribe
+            self._tribe_candidates[new_leader] = candidates
+            self.events.emit(EventKind.LEADER_CHANGE, old_leader.id, new_leader.id)
+        else:
+            self.events.emit(EventKind.TRIBE_DISSOLVED, old_leader.id)
+        self._push_free([old_leader])
+
+    def transfer_leadership(self, old_leader: Human, new_leader: Human) -> None:
+        """
+        Hand over tribe of old_leader to new_leader (usually one of its members).
+        
+        Args:
+            old_leader (Human): Current tribe leader
+            new_leader (Human): Human taking over all members
+        """
+        if self.is_leader(old_leader):
+            self._hand_over(old_leader, new_leader)
+
+    def age_humans(self, years: int = 1) -> None:
+        """
+        Increase age of all humans, adding new adults to the marriage pool
+        and humans reaching LEADER_MIN_AGE to the leadership heaps.
+        
+        Args:
+            years (int): Number of years to add
+        """
+        ages = self.ages[:len(self.humans)]
+        newly_adult = np.flatnonzero((ages < self.PARENTS_AGE) & (ages + years >= self.PARENTS_AGE))
+        coming_of_age = np.flatnonzero((ages < self.LEADER_MIN_AGE) & (ages + years >= self.LEADER_MIN_AGE))
+        ages += years
+        
+        for row in self._candidate_rows(coming_of_age).tolist():
+            human = self.humans[row]
+            leader = self.relations.first(human, 'member')
+            if leader is not None:
+                self._tribe_candidates.setdefault(leader, CandidateHeap()).push(
+                    human, self.leadership_score(human))
+            elif human not in self.tribe_registry:
+                self._push_free([human])
+        
+        for row in newly_adult.tolist():
+            human = self.humans[row]
+            if self._is_available_parent(human):
+                self.unmarried[human.gender].add(human)
+
+    def death_chance(self, ages: np.ndarray) -> np.ndarray:
+        """
+        Compute yearly probability of natural death for an array of ages.
+        
+        Args:
+            ages (np.ndarray): Ages of humans
+            
+        Returns:
+            np.ndarray: Death probability for every age
+        """
+        return np.where(ages > self.MORTALITY_AGE,
+                        (ages - self.MORTALITY_AGE) / self.MORTALITY_SCALE, 0.0)
+
+    def advance_year(self, years: int = 1) -> List[Human]:
+        """
+        Age the whole population and sample natural deaths.
+        
+        Deaths are drawn with one call to the random generator for the whole
+        population. Dying humans are not removed yet, so that callers can
+        handle e.g. leader succession before passing them to remove_humans.
+        
+        Args:
+            years (int): Number of years to add
+            
+        Returns:
+            List[Human]: Humans who die this year
+        """
+        self.age_humans(years)
+        self.events.year += years
+        count = len(self.humans)
+        dying = np.flatnonzero(self.rng.random(count) < self.death_chance(self.ages[:count]))
+        return [self.humans[row] for row in dying.tolist()]
+
+    def remove_human(self, human: Human) -> None:
+        """
+        Remove human from simulation together with all its relations.
+        
+        Args:
+            human (Human): Human to remove
+        """
+        self.remove_humans([human])
+
+    def remove_humans(self, humans: Iterable[Human]) -> None:
+        """
+        Remove many humans at once together with all their relations.
+        
+        Widowed spouses return to the marriage pool and a dead leader's tribe
+        is dissolved unless leadership was transferred before. Ancestor sets
+        of removed humans are dropped from lineage (descendants keep theirs). Every removed
+        row is filled with the last human (swap with last), so the cost does
+        not depend on population size; the order of humans changes.
+        
+        Args:
+            humans (Iterable[Human]): Humans to remove (others are ignored)
+        """
+        removed = {human for human in humans if human._world is self}
+        if not removed:
+            return
+        
+        widowed = []
+        freed = []
+        for human in removed:
+            spouse = self.get_spouse(human)
+            if spouse is not None:
+                widowed.append(spouse)
+            self.events.emit(EventKind.DEATH, human.id, NONE if spouse is None else spouse.id)
+            if human in self.tribe_registry:
+                freed.extend(self.tribe_registry.pop(human).members)
+                self._tribe_candidates.pop(human, None)
+                self.version += 1
+                self.events.emit(EventKind.TRIBE_DISSOLVED, human.id)
+            elif self.get_leader(human) is not None:
+                self._leave_tribe(human)
+            self.unmarried[human.gender].discard(human)
+            self.relations.remove_node(human)
+        
+        for spouse in widowed:
+            if spouse not in removed and self._is_available_parent(spouse):
+                self.unmarried[spouse.gender].add(spouse)
+        self._push_free(human for human in freed if human not in removed)
+        
+        self.lineage.forget(human.id for human in removed)
+        for human in removed:
+            self._release_row(human)
+
+    def _release_row(self, human: Human) -> None:
+        """Unbind human from its row and move the last human into it."""
+        row = human._row
+        values = [self.ages[row].item(), *self.traits[row].tolist()]
+        human._world = None
+        human._row = -1
+        self.uuids.pop(human.id, None)
+        for name, value in zip(WORLD_FIELDS, values):
+            setattr(human, name, value)
+        
+        last = self.humans.pop()
+        if last is not human:
+            last_row = len(self.humans)
+            self.humans[row] = last
+            self.ages[row] = self.ages[last_row]
+            self.traits[row] = self.traits[last_row]
+            last._row = row
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Slot-indexed inventories with interned item ids.
+
+Item names are interned once in an ItemRegistry (seeded from
+data.plan.plans.basic_items), and every entity owns one row of a shared
+count matrix, so checking, adding and removing an item are O(1) array
+operations and "who owns X" is a single column scan.
+
+Example:
+    >>> store = InventoryStore()
+    >>> smith, healer = store.add_entity(), store.add_entity()
+    >>> store.add(smith, "tools", 2)
+    >>> store.add(healer, "herbs")
+    >>> store.has(smith, "tools"), store.has(healer, "tools")
+    (True, False)
+    >>> store.owners("herbs").tolist()
+    [1]
+    >>> bag = Inventory(store, smith)
+    >>> "tools" in bag, bag.count("tools")
+    (True, 2)
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from data.plan.plans import basic_items, medieval_tasks
+
+
+class ItemRegistry:
+    """
+    Interning table mapping item names to dense integer ids.
+
+    Attributes:
+        names (list[str]): Item name for every id
+        ids (dict[str, int]): Id for every item name
+    """
+
+    def __init__(self, items: Iterable[str] = ()) -> None:
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for item in items:
+            self.intern(item)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def intern(self, name: str) -> int:
+        """Return id of item, registering it if seen for the first time."""
+        item_id = self.ids.get(name)
+        if item_id is None:
+            item_id = len(self.names)
+            self.ids[name] = item_id
+            self.names.append(name)
+        return item_id
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Return id of a known item or None."""
+        return self.ids.get(name)
+
+    def name_of(self, item_id: int) -> str:
+        """Return name of item with given id."""
+        return self.names[item_id]
+
+
+def _task_items() -> List[str]:
+    """Items required by medieval tasks, e.g. 'prayer book' missing from basic_items."""
+    return sorted({item for tasks in medieval_tasks.values() for task in tasks for item in task["needs"]})
+
+
+default_registry = ItemRegistry([*basic_items, *_task_items()])
+
+
+class InventoryStore:
+    """
+    Item counts of many entities stored in one (entities, items) matrix.
+
+    Attributes:
+        registry (ItemRegistry): Item interning table
+        counts (np.ndarray): uint16 matrix of item counts, one row per entity
+
+    Methods:
+        add_entity() -> int: Allocates an empty inventory row.
+        release(entity) -> None: Empties a row and makes it reusable (once).
+        has(entity, item) -> bool: Checks if entity has an item.
+        count(entity, item) -> int: Number of items held by entity.
+        add(entity, item, amount) -> None: Adds items.
+        remove(entity, item, amount) -> bool: Removes items if available.
+        items_of(entity) -> dict[str, int]: Inventory of entity.
+        owners(item, amount) -> np.ndarray: Entities holding item.
+        owners_of_all(items) -> np.ndarray: Entities holding all items.
+    """
+    MAX_COUNT = np.iinfo(np.uint16).max
+
+    def __init__(self, registry: Optional[ItemRegistry] = None, capacity: int = 64) -> None:
+        self.registry: ItemRegistry = registry if registry is not None else default_registry
+        self.counts: np.ndarray = np.zeros((capacity, max(len(self.registry), 1)), dtype=np.uint16)
+        self._size: int = 0
+        self._free: List[int] = []
+        self._released: Set[int] = set()  # wiersze na liście _free
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def _item_id(self, item: str) -> int:
+        item_id = self.registry.intern(item)
+        if item_id >= self.counts.shape[1]:
+            grown = np.zeros((self.counts.shape[0], max(item_id + 1, self.counts.shape[1] * 2)),
+                             dtype=np.uint16)
+            grown[:, :self.counts.shape[1]] = self.counts
+            self.counts = grown
+        return item_id
+
+    def add_entity(self) -> int:
+        """Allocate an empty inventory and return its entity row."""
+        if self._free:
+            entity = self._free.pop()
+            self._released.discard(entity)
+            return entity
+        if self._size == self.counts.shape[0]:
+            grown = np.zeros((self._size * 2, self.counts.shape[1]), dtype=np.uint16)
+            grown[:self._size] = self.counts
+            self.counts = grown
+        self._size += 1
+        return self._size - 1
+
+    def release(self, entity: int) -> None:
+        """
+        Empty the inventory of entity and make its row reusable.
+
+        Raises:
+            ValueError: If the row was not allocated or is already released
+        """
+        if not 0 <= entity < self._size or entity in self._released:
+            raise ValueError(f"Inventory row {entity} is not in use")
+        self.counts[entity] = 0
+        self._free.append(entity)
+        self._released.add(entity)
+
+    def has(self, entity: int, item: str) -> bool:
+        """Check if entity holds at least one item."""
+        item_id = self.registry.id_of(item)
+        return (item_id is not None and item_id < self.counts.shape[1]
+                and bool(self.counts[entity, item_id]))
+
+    def count(self, entity: int, item: str) -> int:
+        """Return number of items held by entity."""
+        item_id = self.registry.id_of(item)
+        if item_id is None or item_id >= self.counts.shape[1]:
+            return 0
+        return int(self.counts[entity, item_id])
+
+    def add(self, entity: int, item: str, amount: int = 1) -> None:
+        """Add items to inventory of entity (amount must be positive)."""
+        if amount <= 0:
+            raise ValueError(f"Amount must be positive, got {amount}")
+        item_id = self._item_id(item)
+        total = int(self.counts[entity, item_id]) + amount
+        if total > self.MAX_COUNT:
+            raise OverflowError(f"Too many '{item}' in one inventory")
+        self.counts[entity, item_id] = total
+
+    def remove(self, entity: int, item: str, amount: int = 1) -> bool:
+        """
+        Remove items from inventory of entity.
+
+        Returns:
+            bool: False (and nothing removed) if entity holds fewer items
+
+        Raises:
+            ValueError: If amount is not positive
+        """
+        if amount <= 0:
+            raise ValueError(f"Amount must be positive, got {amount}")
+        item_id = self.registry.id_of(item)
+        if item_id is None or self.count(entity, item) < amount:
+            return False
+        self.counts[entity, item_id] -= amount
+        return True
+
+    def items_of(self, entity: int) -> Dict[str, int]:
+        """Return inventory of entity as item name -> count."""
+        row = self.counts[entity]
+        return {self.registry.names[i]: int(row[i]) for i in np.flatnonzero(row)}
+
+    def owners(self, item: str, amount: int = 1) -> np.ndarray:
+        """Return ids of entities holding at least amount of item."""
+        item_id = self.registry.id_of(item)
+        if item_id is None or item_id >= self.counts.shape[1]:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.counts[:self._size, item_id] >= amount)
+
+    def owners_of_all(self, items: Iterable[str]) -> np.ndarray:
+        """Return ids of entities holding every item from the list (e.g. Task.needs)."""
+        item_ids = [self.registry.id_of(item) for item in items]
+        if any(i is None or i >= self.counts.shape[1] for i in item_ids):
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero((self.counts[:self._size, item_ids] > 0).all(axis=1))
+
+
+default_store = InventoryStore()
+
+
+class Inventory:
+    """
+    Inventory of a single entity, backed by a row of an InventoryStore.
+
+    Supports `item in inventory` membership checks in O(1).
+    """
+
+    def __init__(self, store: Optional[InventoryStore] = None, entity: Optional[int] = None) -> None:
+        self.store: InventoryStore = store if store is not None else default_store
+        self.entity: int = self.store.add_entity() if entity is None else entity
+
+    def __contains__(self, item: str) -> bool:
+        return self.store.has(self.entity, item)
+
+    def __repr__(self) -> str:
+        return f"Inventory({self.store.items_of(self.entity)})"
+
+    def has(self, item: str) -> bool:
+        return self.store.has(self.entity, item)
+
+    def count(self, item: str) -> int:
+        return self.store.count(self.entity, item)
+
+    def add(self, item: str, amount: int = 1) -> None:
+        self.store.add(self.entity, item, amount)
+
+    def remove(self, item: str, amount: int = 1) -> bool:
+        return self.store.remove(self.entity, item, amount)
+
+    def items(self) -> Dict[str, int]:
+        return self.store.items_of(self.entity)
+
+    def release(self) -> None:
+        """Give the row back to the store; the inventory must not be used afterwards."""
+        self.store.release(self.entity)
@@ -0,0 +1,245 @@
+"""
+Incremental layout of the society graph.
+
+SocietyLayout keeps node positions between years instead of computing a new
+spring layout from random positions on every redraw. New humans are placed
+next to their parents (or spouse), and only a few warm-start iterations of
+a Fruchterman-Reingold relaxation are run, so the picture changes smoothly.
+Above a node threshold the graph is downsampled to tribe-level super-nodes
+(one node per tribe plus one for humans without a tribe), which keeps the
+O(N²) relaxation small.
+
+Example:
+    >>> from humanity import Humanity
+    >>> world = Humanity(seed=1)
+    >>> _ = world.create_humans(40, ages=30)
+    >>> layout = SocietyLayout(seed=1)
+    >>> view = layout.update(world)
+    >>> view.aggregated, len(view.positions)
+    (False, 40)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from humanity import Humanity
+
+FREE: str = "free"  # super-node of humans without a tribe
+RELATIONS: Tuple[str, ...] = ('leader', 'member', 'spouse', 'father', 'mother')
+ATTRACTING: Tuple[str, ...] = ('leader', 'spouse', 'father', 'mother')  # 'member' powtarza 'leader'
+FIRST_ITERATIONS: int = 50  # pełny układ, gdy większość węzłów jest nowa
+
+
+@dataclass
+class LayoutView:
+    """
+    Graph prepared for drawing.
+
+    Attributes:
+        nodes (list): Humans, or tribe leaders and FREE when aggregated
+        positions (np.ndarray): (N, 2) positions of nodes, in order of nodes
+        edges (dict[str, np.ndarray]): Relation -> (E, 2) array of node indexes
+        sizes (np.ndarray): Number of humans represented by every node
+        aggregated (bool): Whether nodes are tribe-level super-nodes
+    """
+    nodes: List[Hashable]
+    positions: np.ndarray
+    edges: Dict[str, np.ndarray]
+    sizes: np.ndarray
+    aggregated: bool
+
+    @property
+    def pos(self) -> Dict[Hashable, np.ndarray]:
+        """Positions as node -> (x, y) dictionary (networkx format)."""
+        return dict(zip(self.nodes, self.positions))
+
+
+def relax(positions: np.ndarray,
+          edges: np.ndarray,
+          iterations: int = 5,
+          temperature: float = 0.1,
+          weights: Optional[np.ndarray] = None,
+          spread: float = 2.0,
+          gravity: float = 0.1) -> np.ndarray:
+    """
+    Run Fruchterman-Reingold iterations starting from given positions.
+
+    Args:
+        positions (np.ndarray): (N, 2) initial positions (not modified)
+        edges (np.ndarray): (E, 2) node indexes of attracting pairs
+        iterations (int): Number of iterations
+        temperature (float): Largest step of a node in the first iteration
+        weights (Optional[np.ndarray]): Attraction weight of every edge
+        spread (float): Optimal distance between nodes, times 1/sqrt(N)
+        gravity (float): Pull towards the centre (keeps isolated nodes close)
+
+    Returns:
+        np.ndarray: (N, 2) new positions
+    """
+    pos = np.array(positions, dtype=np.float64)
+    count = len(pos)
+    if count < 2:
+        return pos
+    k = spread / np.sqrt(count)
+    weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    for step in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=2), 0.01)
+        # Odpychanie wszystkich par: k² / d w kierunku delta
+        shift = (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1)
+
+        if len(edges):
+            src, dst = edges[:, 0], edges[:, 1]
+            pull = delta[src, dst] * (distance[src, dst] / k * weights)[:, None]
+            np.add.at(shift, src, -pull)
+            np.add.at(shift, dst, pull)
+        shift -= gravity * pos * np.linalg.norm(pos, axis=1)[:, None]
+
+        length = np.maximum(np.linalg.norm(shift, axis=1), 1e-9)
+        limit = temperature * (1.0 - step / iterations)
+        pos += shift * (np.minimum(length, limit) / length)[:, None]
+    return pos
+
+
+class SocietyLayout:
+    """
+    Node positions of the society view, kept between redraws.
+
+    Attributes:
+        positions (dict): Human -> (x, y) position
+        tribe_positions (dict): Tribe leader (or FREE) -> (x, y) position of super-node
+        max_nodes (int): Above this many humans the view shows tribes instead
+        iterations (int): Warm-start iterations per update
+        temperature (float): Largest step of a node per update
+    """
+
+    def __init__(self,
+                 max_nodes: int = 300,
+                 iterations: int = 5,
+                 temperature: float = 0.05,
+                 seed: Optional[int] = None) -> None:
+        self.positions: Dict[Hashable, np.ndarray] = {}
+        self.tribe_positions: Dict[Hashable, np.ndarray] = {}
+        self.max_nodes = max_nodes
+        self.iterations = iterations
+        self.temperature = temperature
+        self.rng = np.random.default_rng(seed)
+
+    def _random_position(self) -> np.ndarray:
+        return self.rng.uniform(-1.0, 1.0, 2)
+
+    def _near(self, anchors: List[np.ndarray]) -> np.ndarray:
+        """Position next to the mean of anchors (random if there are none)."""
+        if not anchors:
+            return self._random_position()
+        return np.mean(anchors, axis=0) + self.rng.normal(0.0, 0.05, 2)
+
+    def _place(self, cache: Dict[Hashable, np.ndarray], nodes: List[Hashable], anchors_of) -> Tuple[np.ndarray, int]:
+        """Drop positions of nodes that disappeared and seed positions of new ones."""
+        alive = set(nodes)
+        for node in [node for node in cache if node not in alive]:
+            del cache[node]
+        new = [node for node in nodes if node not in cache]
+        added = len(new)
+        # Rodzice przed dziećmi - dzieci trafiają obok już rozmieszczonych rodziców
+        pending = len(new) + 1
+        while new and len(new) < pending:
+            pending = len(new)
+            waiting = []
+            for node in new:
+                anchors = anchors_of(node)
+                if anchors is None:
+                    waiting.append(node)
+                else:
+                    cache[node] = self._near(anchors)
+            new = waiting
+        for node in new:
+            cache[node] = self._random_position()
+        return np.array([cache[node] for node in nodes]).reshape(-1, 2), added
+
+    def _relax(self, pos: np.ndarray, added: int, edges: np.ndarray,
+               weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Warm-start relaxation, or a full one when most nodes are new."""
+        if added * 2 > len(pos):
+            return relax(pos, edges, FIRST_ITERATIONS, 0.1, weights)
+        return relax(pos, edges, self.iterations, self.temperature, weights)
+
+    def _human_view(self, humanity: Humanity) -> LayoutView:
+        relations = humanity.relations
+        nodes = list(humanity.humans)
+        positions = self.positions
+
+        def anchors_of(human):
+            parents = humanity.get_parents(human)
+            if not parents:
+                spouse = humanity.get_spouse(human)
+                parents = [spouse] if spouse is not None else []
+            anchors = [positions[p] for p in parents if p in positions]
+            if parents and not anchors:
+                return None  # rodzice też są nowi - poczekaj na nich
+            return anchors
+
+        pos, added = self._place(positions, nodes, anchors_of)
+        index = {human: i for i, human in enumerate(nodes)}
+        edges = {
+            relation: np.array([(index[src], index[dst]) for src, dst in relations.edges(relation)],
+                               dtype=np.intp).reshape(-1, 2)
+            for relation in RELATIONS
+        }
+        pos = self._relax(pos, added, np.concatenate([edges[relation] for relation in ATTRACTING]))
+        for human, xy in zip(nodes, pos):
+            positions[human] = xy
+        return LayoutView(nodes, pos, edges, np.ones(len(nodes), dtype=np.int64), aggregated=False)
+
+    def _tribe_view(self, humanity: Humanity) -> LayoutView:
+        relations = humanity.relations
+        group: Dict[Hashable, Hashable] = {}
+        for leader, tribe in humanity.tribe_registry.items():
+            group[leader] = leader
+            for member in tribe.members:
+                group[member] = leader
+        nodes: List[Hashable] = list(humanity.tribe_registry) + [FREE]
+        index = {node: i for i, node in enumerate(nodes)}
+        sizes = np.array([len(humanity.tribe_registry[leader]) + 1 for leader in nodes[:-1]]
+                         + [len(humanity.humans) - len(group)], dtype=np.int64)
+
+        # Powiązania rodzinne między plemionami, zliczone jako wagi krawędzi
+        links: Dict[Tuple[int, int], int] = {}
+        for relation in ('spouse', 'father', 'mother'):
+            # Relacje symetryczne (spouse) są zapisane w obu kierunkach - liczymy parę raz
+            symmetric = relation in relations.symmetric
+            for src, dst in relations.edges(relation):
+                a, b = index[group.get(src, FREE)], index[group.get(dst, FREE)]
+                if a == b or (symmetric and a > b):
+                    continue
+                pair = (min(a, b), max(a, b))
+                links[pair] = links.get(pair, 0) + 1
+        edges = np.array(list(links), dtype=np.intp).reshape(-1, 2)
+        weights = np.array(list(links.values()), dtype=np.float64)
+        if len(weights):
+            weights = weights / weights.max()
+
+        pos, added = self._place(self.tribe_positions, nodes, lambda node: [])
+        pos = self._relax(pos, added, edges, weights)
+        for node, xy in zip(nodes, pos):
+            self.tribe_positions[node] = xy
+        return LayoutView(nodes, pos, {'link': edges}, sizes, aggregated=True)
+
+    def update(self, humanity: Humanity) -> LayoutView:
+        """
+        Update positions after changes of humanity and return the view to draw.
+
+        Args:
+            humanity (Humanity): Simulated community
+
+        Returns:
+            LayoutView: Humans (or tribes above max_nodes) with their positions
+        """
+        if len(humanity.humans) > self.max_nodes:
+            self.positions.clear()
+            return self._tribe_view(humanity)
+        self.tribe_positions.clear()
+        return self._human_view(humanity)
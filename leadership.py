@@ -0,0 +1,92 @@
+"""
+Max-heaps of leadership candidates with lazy invalidation.
+
+Humanity keeps one CandidateHeap per tribe (eligible members) and one for
+humans without a tribe, so a new leader is picked in O(log n) instead of
+scanning all members or all humans. Entries are not removed when a candidate
+dies or changes tribe; best() drops them when they reach the top and turn
+out to be invalid.
+
+Example:
+    >>> heap = CandidateHeap()
+    >>> for name, score in [("Mieszko", 2.1), ("Dobrawa", 2.5), ("Bolesław", 2.3)]:
+    ...     heap.push(name, score)
+    >>> heap.best(lambda human: True)
+    'Dobrawa'
+    >>> heap.best(lambda human: human != "Dobrawa")  # Dobrawa left the tribe
+    'Bolesław'
+    >>> heap.best(lambda human: True, exclude={"Bolesław"}), len(heap)
+    ('Mieszko', 2)
+"""
+
+import heapq
+import itertools
+from typing import Callable, Collection, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+# Wspólny licznik - rozstrzyga remisy bez porównywania ludzi i przy łączeniu kopców
+_sequence = itertools.count()
+
+
+class CandidateHeap(Generic[T]):
+    """
+    Max-heap of candidates ordered by leadership score.
+
+    Methods:
+        push(candidate, score) -> None: Adds a candidate.
+        extend(pairs) -> None: Adds many (candidate, score) pairs.
+        merge(other) -> CandidateHeap: Joins two heaps, reusing the bigger one.
+        best(is_valid, exclude) -> candidate | None: Best valid candidate.
+        compact(is_valid) -> None: Drops all invalid entries.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[T, float]] = ()) -> None:
+        self._heap: List[Tuple[float, int, T]] = [(-score, next(_sequence), candidate)
+                                                  for candidate, score in pairs]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, candidate: T, score: float) -> None:
+        heapq.heappush(self._heap, (-score, next(_sequence), candidate))
+
+    def extend(self, pairs: Iterable[Tuple[T, float]]) -> None:
+        self._heap.extend((-score, next(_sequence), candidate) for candidate, score in pairs)
+        heapq.heapify(self._heap)
+
+    def merge(self, other: "CandidateHeap[T]") -> "CandidateHeap[T]":
+        """Move entries of the smaller heap into the bigger one and return it."""
+        big, small = (self, other) if len(self) >= len(other) else (other, self)
+        big._heap.extend(small._heap)
+        heapq.heapify(big._heap)
+        small._heap = []
+        return big
+
+    def best(self, is_valid: Callable[[T], bool], exclude: Collection[T] = ()) -> Optional[T]:
+        """
+        Return valid candidate with the highest score without removing it.
+
+        Args:
+            is_valid (Callable[[T], bool]): False for stale entries, which are dropped
+            exclude (Collection[T]): Candidates skipped this time but kept in the heap
+
+        Returns:
+            Optional[T]: Best candidate or None
+        """
+        heap = self._heap
+        skipped = []
+        while heap and (not is_valid(heap[0][2]) or heap[0][2] in exclude):
+            entry = heapq.heappop(heap)
+            if entry[2] in exclude and is_valid(entry[2]):
+                skipped.append(entry)
+        result = heap[0][2] if heap else None
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return result
+
+    def compact(self, is_valid: Callable[[T], bool]) -> None:
+        """Remove all invalid entries at once."""
+        self._heap = [entry for entry in self._heap if is_valid(entry[2])]
+        heapq.heapify(self._heap)
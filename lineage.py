@@ -0,0 +1,233 @@
+"""
+Genealogy index for kinship queries.
+
+Genealogy keeps parents and generation number of every human in arrays
+indexed by human id (ids are consecutive ints given out by Humanity), and
+for every child the set of its ancestors up to max_depth generations back,
+built from the parents' sets at birth. "Is X a descendant of Y", common
+ancestors or cousin checks are then a few dictionary lookups instead of a
+BFS over the whole relation graph, which also holds tribe and spouse edges.
+
+Parents and generations are kept after death, and the ancestor sets of
+the living include their dead ancestors, so kinship through them is known.
+The ancestor set of a dead human is only needed for queries about that
+human, so Humanity drops it on removal (forget) to keep memory bounded by
+the living population.
+
+Humans never registered (e.g. the initial population) are founders: no
+known parents, generation 0.
+
+Example:
+    >>> tree = Genealogy()
+    >>> tree.add_birth(2, father=0, mother=1)
+    >>> tree.add_birth(4, father=2, mother=3)
+    >>> tree.add_birth(6, father=5, mother=1)
+    >>> tree.is_ancestor(0, 4), tree.generation(4)
+    (True, 2)
+    >>> sorted(tree.common_ancestors(4, 6))
+    [1]
+    >>> tree.are_siblings(2, 6), tree.are_close_kin(4, 6)
+    (True, True)
+"""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+NONE: int = -1  # brak znanego rodzica
+
+_NO_ANCESTORS: Dict[int, int] = {}
+
+
+class Genealogy:
+    """
+    Parent arrays, generations and depth-limited ancestor sets.
+
+    Attributes:
+        father (np.ndarray): Id of father of every human id (NONE if unknown)
+        mother (np.ndarray): Id of mother of every human id (NONE if unknown)
+        generations (np.ndarray): Generation number of every human id
+        max_depth (int): How many generations back ancestor sets reach
+
+    Methods:
+        add_birth(child, father, mother) -> None: Registers a child.
+        parents(human) -> tuple: Known parent ids.
+        generation(human) -> int: Generation number.
+        ancestors(human) -> dict: Ancestor id -> distance in generations.
+        is_ancestor(ancestor, human) -> bool: Checks descent (any depth).
+        common_ancestors(a, b) -> set: Ancestors shared within max_depth.
+        are_siblings(a, b) -> bool: Share at least one parent.
+        are_cousins(a, b) -> bool: Share a grandparent but no parent.
+        are_close_kin(a, b, depth) -> bool: Same person, descent or shared ancestor within depth.
+        close_kin_many(a, b, depth) -> np.ndarray: are_close_kin for arrays of pairs.
+        forget(humans) -> None: Drops ancestor sets of humans no longer queried.
+    """
+
+    def __init__(self, max_depth: int = 3, capacity: int = 64) -> None:
+        self.max_depth: int = max_depth
+        self.father: np.ndarray = np.full(capacity, NONE, dtype=np.int64)
+        self.mother: np.ndarray = np.full(capacity, NONE, dtype=np.int64)
+        self.generations: np.ndarray = np.zeros(capacity, dtype=np.int32)
+        self._ancestors: Dict[int, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ancestors)
+
+    def _reserve(self, human: int) -> None:
+        capacity = len(self.father)
+        if human < capacity:
+            return
+        while capacity <= human:
+            capacity *= 2
+        for name, fill in (("father", NONE), ("mother", NONE), ("generations", 0)):
+            old = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def add_birth(self, child: int, father: Optional[int] = None, mother: Optional[int] = None) -> None:
+        """
+        Register child of given parents.
+
+        Args:
+            child (int): Id of the child
+            father (Optional[int]): Id of father (None if unknown)
+            mother (Optional[int]): Id of mother (None if unknown)
+        """
+        self._reserve(max(child, father or 0, mother or 0))
+        ancestors: Dict[int, int] = {}
+        generation = 0
+        for parent, column in ((father, self.father), (mother, self.mother)):
+            if parent is None:
+                continue
+            column[child] = parent
+            generation = max(generation, int(self.generations[parent]) + 1)
+            ancestors[parent] = 1
+            for ancestor, distance in self._ancestors.get(parent, _NO_ANCESTORS).items():
+                if distance < self.max_depth and ancestors.get(ancestor, distance + 1) >= distance + 1:
+                    ancestors[ancestor] = distance + 1
+        self.generations[child] = generation
+        self._ancestors[child] = ancestors
+
+    def parents(self, human: int) -> Tuple[int, ...]:
+        """Return ids of known parents."""
+        if human >= len(self.father):
+            return ()
+        return tuple(p for p in (int(self.father[human]), int(self.mother[human])) if p != NONE)
+
+    def generation(self, human: int) -> int:
+        """Return generation number (0 for founders)."""
+        return int(self.generations[human]) if human < len(self.generations) else 0
+
+    def ancestors(self, human: int) -> Dict[int, int]:
+        """Return ancestors within max_depth as id -> distance in generations (do not modify)."""
+        return self._ancestors.get(human, _NO_ANCESTORS)
+
+    def is_ancestor(self, ancestor: int, human: int) -> bool:
+        """
+        Check if ancestor is a parent, grandparent... of human, at any depth.
+
+        Within max_depth this is a single lookup; deeper ancestors are
+        searched upwards through parent arrays, pruned by generation numbers.
+        """
+        if ancestor in self.ancestors(human):
+            return True
+        target = self.generation(ancestor)
+        if self.generation(human) - target <= self.max_depth:
+            return False
+        frontier = [a for a, distance in self.ancestors(human).items() if distance == self.max_depth]
+        seen: Set[int] = set(frontier)
+        while frontier:
+            current = frontier.pop()
+            for parent in self.parents(current):
+                if parent == ancestor:
+                    return True
+                if parent not in seen and self.generation(parent) > target:
+                    seen.add(parent)
+                    frontier.append(parent)
+        return False
+
+    def is_descendant(self, human: int, ancestor: int) -> bool:
+        """Check if human descends from ancestor."""
+        return self.is_ancestor(ancestor, human)
+
+    def common_ancestors(self, a: int, b: int) -> Set[int]:
+        """Return ancestors shared by a and b within max_depth."""
+        first, second = self.ancestors(a), self.ancestors(b)
+        if len(first) > len(second):
+            first, second = second, first
+        return {ancestor for ancestor in first if ancestor in second}
+
+    def are_siblings(self, a: int, b: int) -> bool:
+        """Check if a and b share at least one parent."""
+        return a != b and bool(set(self.parents(a)) & set(self.parents(b)))
+
+    def are_cousins(self, a: int, b: int) -> bool:
+        """Check if a and b share a grandparent but not a parent."""
+        if a == b or self.are_siblings(a, b):
+            return False
+        first, second = self.ancestors(a), self.ancestors(b)
+        return any(first.get(ancestor) == 2 and second.get(ancestor) == 2 for ancestor in first)
+
+    def are_close_kin(self, a: int, b: int, depth: int = 2) -> bool:
+        """
+        Check if a and b are the same person, one descends from the other,
+        or they share an ancestor at most depth generations back from both.
+
+        Used to avoid marriages between close relatives (depth 2 = cousins).
+        """
+        if a == b:
+            return True
+        first, second = self.ancestors(a), self.ancestors(b)
+        if first.get(b, depth + 1) <= depth or second.get(a, depth + 1) <= depth:
+            return True
+        if not first or not second:
+            return False
+        if len(first) > len(second):
+            first, second = second, first
+        return any(distance <= depth and second.get(ancestor, depth + 1) <= depth
+                   for ancestor, distance in first.items())
+
+    def _ancestor_columns(self, humans: np.ndarray, depth: int) -> np.ndarray:
+        """Ancestors of humans up to depth generations back, one row per human (NONE where unknown)."""
+        columns = []
+        generation = humans.reshape(-1, 1)
+        for _ in range(depth):
+            known = (generation >= 0) & (generation < len(self.father))
+            safe = np.where(known, generation, 0)
+            generation = np.where(np.concatenate([known, known], axis=1),
+                                  np.concatenate([self.father[safe], self.mother[safe]], axis=1), NONE)
+            columns.append(generation)
+        return np.concatenate(columns, axis=1) if columns else np.full((len(humans), 0), NONE, dtype=np.int64)
+
+    def close_kin_many(self, a: np.ndarray, b: np.ndarray, depth: int = 2) -> np.ndarray:
+        """
+        Vectorized are_close_kin for pairs (a[i], b[i]).
+
+        Ancestors are read from the parent arrays, so the answer for the
+        living is the same as from their ancestor sets.
+
+        Args:
+            a (np.ndarray): Ids of first humans of pairs
+            b (np.ndarray): Ids of second humans of pairs
+            depth (int): Generations searched back (at most max_depth)
+
+        Returns:
+            np.ndarray: Bool array, True where the pair are close kin
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        depth = min(depth, self.max_depth)
+        first, second = self._ancestor_columns(a, depth), self._ancestor_columns(b, depth)
+        shared = (first[:, :, None] == second[:, None, :]) & (first[:, :, None] != NONE)
+        return ((a == b) | (first == b[:, None]).any(axis=1) | (second == a[:, None]).any(axis=1)
+                | shared.any(axis=(1, 2)))
+
+    def forget(self, humans: Iterable[int]) -> None:
+        """
+        Drop ancestor sets of humans whose kinship will not be asked any more
+        (e.g. the dead). Queries about them afterwards see no ancestors within
+        max_depth; queries about their descendants are not affected.
+        """
+        for human in humans:
+            self._ancestors.pop(human, None)
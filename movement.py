@@ -0,0 +1,135 @@
+"""
+Batch movement validation for pooled characters.
+
+The tick loop collects movement intents (entity, dx, dy) for all NPCs and
+passes them to MovementResolver.resolve, which checks the same walk/jump
+rules as Character.move and Character.jump for the whole batch with array
+masks, resolves conflicts for occupied tiles and commits accepted moves at
+once.
+
+Example:
+    >>> from character import Character, CharacterPool
+    >>> from environment import Environment
+    >>> pool = CharacterPool()
+    >>> for x in range(3):
+    ...     _ = pool.add(Character(x, 0, {}))
+    >>> resolver = MovementResolver(Environment(seed=1), pool)
+    >>> resolver.resolve([0, 1, 2], [0, 0, 0], [1, 1, 1]).tolist()
+    [True, True, True]
+    >>> resolver.resolve([0, 2], [1, -1], [0, 0]).tolist()  # both into the tile of entity 1
+    [False, False]
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from character import CharacterPool
+from environment import Environment
+
+
+def _tile_keys(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Pack tile coordinates into single int64 keys."""
+    return (xs.astype(np.int64) << 32) ^ (ys.astype(np.int64) & 0xFFFFFFFF)
+
+
+class MovementResolver:
+    """
+    Validates and applies movement intents of many characters per tick.
+
+    Attributes:
+        environment (Environment): Source of terrain heights (chunk store)
+        pool (CharacterPool): Positions of characters
+        spatial_index (SpatialHash | None): Index updated with accepted moves
+        height_levels (int): Number of blocks terrain height 0.0-1.0 is split into
+        MAX_WALK_DOWN (int): Largest drop allowed when walking (as Character._possible_moves)
+        MAX_JUMP_UP (int): Largest climb allowed when jumping (as Character.jump)
+    """
+    MAX_WALK_DOWN = 1
+    MAX_JUMP_UP = 2
+
+    def __init__(self,
+                 environment: Environment,
+                 pool: CharacterPool,
+                 spatial_index=None,
+                 height_levels: int = 10) -> None:
+        self.environment = environment
+        self.pool = pool
+        self.spatial_index = spatial_index
+        self.height_levels = height_levels
+
+    def block_heights(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Get terrain heights in blocks for arrays of positions."""
+        heights = self.environment.heights_at(xs, ys)
+        return np.minimum(heights * self.height_levels, self.height_levels - 1).astype(np.int64)
+
+    def resolve(self,
+                ids: Sequence[int],
+                dx: Sequence[int],
+                dy: Sequence[int],
+                jump: Optional[Sequence[bool]] = None) -> np.ndarray:
+        """
+        Validate movement intents and commit all accepted moves.
+
+        Args:
+            ids (Sequence[int]): Pool ids of moving characters
+            dx (Sequence[int]): Step along X axis
+            dy (Sequence[int]): Step along Y axis
+            jump (Sequence[bool] | None): Whether each move is a jump
+
+        Returns:
+            np.ndarray: Boolean mask of accepted intents
+        """
+        pool = self.pool
+        ids = np.asarray(ids, dtype=np.intp)
+        count = len(ids)
+        jump = np.zeros(count, dtype=np.bool_) if jump is None else np.asarray(jump, dtype=np.bool_)
+
+        src_x, src_y = pool.x[ids], pool.y[ids]
+        dst_x = src_x + np.asarray(dx, dtype=np.int64)
+        dst_y = src_y + np.asarray(dy, dtype=np.int64)
+
+        heights = self.block_heights(np.concatenate([src_x, dst_x]), np.concatenate([src_y, dst_y]))
+        src_z, dst_z = heights[:count], heights[count:]
+        diff = dst_z - src_z
+
+        walk_ok = (diff <= 0) & (diff >= -self.MAX_WALK_DOWN)
+        jump_ok = diff <= self.MAX_JUMP_UP
+        accepted = np.where(jump, jump_ok, walk_ok) & pool.alive[ids]
+
+        # Tylko pierwsza intencja danej postaci w ticku
+        first = np.zeros(count, dtype=np.bool_)
+        first[np.unique(ids, return_index=True)[1]] = True
+        accepted &= first
+
+        alive = np.flatnonzero(pool.alive[:len(pool)])
+        all_keys = _tile_keys(pool.x[alive], pool.y[alive])
+        dst_keys = _tile_keys(dst_x, dst_y)
+
+        # Odrzucone ruchy zostawiają postać na miejscu, co może zablokować
+        # kolejne - powtarzamy aż zbiór zaakceptowanych się ustabilizuje
+        while True:
+            moving = np.zeros(len(pool), dtype=np.bool_)
+            moving[ids[accepted]] = True
+            standing_keys = all_keys[~moving[alive]]
+
+            candidates = np.flatnonzero(accepted)
+            keep = np.zeros(count, dtype=np.bool_)
+            winners = candidates[np.unique(dst_keys[candidates], return_index=True)[1]]
+            keep[winners] = True
+            keep &= ~np.isin(dst_keys, standing_keys)
+
+            if np.array_equal(keep, accepted):
+                break
+            accepted = keep
+
+        moved = ids[accepted]
+        pool.x[moved] = dst_x[accepted]
+        pool.y[moved] = dst_y[accepted]
+        pool.z[moved] = dst_z[accepted]
+
+        if self.spatial_index is not None:
+            for entity, x, y in zip(moved.tolist(), dst_x[accepted].tolist(), dst_y[accepted].tolist()):
+                self.spatial_index.move(entity, x, y)
+
+        return accepted
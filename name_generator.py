@@ -39,7 +39,7 @@ def adjust_suffix(root: str, suffix: str) -> str:
         
     return root + suffix
 
-def generate_tribe_name() -> str:
+def generate_tribe_name(rng: random.Random = random) -> str:
     """
     Generates a random tribe name using predefined components and rules.
     
@@ -48,21 +48,24 @@ def generate_tribe_name() -> str:
     - Mandatory root with suffix
     - Up to 2 additional elements (location, title, etc.) with weighted probabilities
     
+    Args:
+        rng (random.Random): Random generator to draw from (module random by default)
+    
     Returns:
         str: Generated tribe name
     """
     elements: List[str] = []
     
     # Add prefix (40% chance)
-    if random.random() < 0.4:
-        prefix = random.choice(TRIBES_NAMES['prefiksy'])
+    if rng.random() < 0.4:
+        prefix = rng.choice(TRIBES_NAMES['prefiksy'])
         if not prefix.endswith(('o', 'i')):
             prefix += 'o'
         elements.append(prefix)
     
     # Add root and suffix (mandatory)
-    root = random.choice(TRIBES_NAMES['rdzenie'])
-    suffix = random.choice(TRIBES_NAMES['sufiksy'])
+    root = rng.choice(TRIBES_NAMES['rdzenie'])
+    suffix = rng.choice(TRIBES_NAMES['sufiksy'])
     base_name = adjust_suffix(root, suffix)
     elements.append(base_name)
     
@@ -93,9 +96,9 @@ def generate_tribe_name() -> str:
         if not available_categories:
             break
             
-        category = random.choice(available_categories)
-        if random.random() < category_weights[category]:
-            element = random.choice(TRIBES_NAMES[category])
+        category = rng.choice(available_categories)
+        if rng.random() < category_weights[category]:
+            element = rng.choice(TRIBES_NAMES[category])
             if is_compatible(element, selected):
                 selected.append(element)
                 
@@ -0,0 +1,199 @@
+"""
+Index-addressable sets used for eligibility pools.
+
+IndexedSet keeps its items in a list plus an item -> position map, so adding,
+removing (swap with last) and drawing a random item are all O(1).
+
+IdPool does the same for objects with distinct integer ids (humans), but
+keeps items, ids and an id -> position array in numpy arrays: membership is
+an array lookup instead of hashing, and many items can be drawn and removed
+at once with a few array operations. Humanity uses it for the pools of
+unmarried adults, from which all couples of a year are drawn in one batch.
+
+Example:
+    >>> pool = IndexedSet(["a", "b", "c"])
+    >>> pool.discard("a")
+    >>> sorted(pool), "a" in pool, len(pool)
+    (['b', 'c'], False, 2)
+    >>> from types import SimpleNamespace
+    >>> people = IdPool(SimpleNamespace(id=i) for i in range(5))
+    >>> people.discard_at(np.array([0, 3]))
+    >>> sorted(person.id for person in people), len(people)
+    ([1, 2, 4], 3)
+"""
+
+import random
+from typing import Any, Dict, Generic, Hashable, Iterable, Iterator, List, TypeVar
+
+import numpy as np
+
+T = TypeVar("T", bound=Hashable)
+
+
+class IndexedSet(Generic[T]):
+    """
+    Set with O(1) add, discard and random sampling.
+
+    Methods:
+        add(item) -> None: Adds item if not present.
+        discard(item) -> None: Removes item if present.
+        choice(rng) -> item: Returns a random item.
+        pop_random(rng) -> item: Removes and returns a random item.
+    """
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self._items: List[T] = []
+        self._index: Dict[T, int] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._index
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"IndexedSet({self._items!r})"
+
+    def add(self, item: T) -> None:
+        if item not in self._index:
+            self._index[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: T) -> None:
+        position = self._index.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._index[last] = position
+
+    def choice(self, rng=random) -> T:
+        """Return a random item (IndexError if empty)."""
+        return self._items[rng.randrange(len(self._items))]
+
+    def pop_random(self, rng=random) -> T:
+        """Remove and return a random item (IndexError if empty)."""
+        item = self.choice(rng)
+        self.discard(item)
+        return item
+
+
+class IdPool(Generic[T]):
+    """
+    Set of objects with distinct non-negative integer ids (attribute id),
+    stored in numpy arrays.
+
+    Attributes:
+        ids (np.ndarray): Ids of items in pool order (a view, do not modify)
+
+    Methods:
+        add(item) -> None: Adds item if not present.
+        discard(item) -> None: Removes item if present.
+        choice(rng) -> item: Returns a random item.
+        pop_random(rng) -> item: Removes and returns a random item.
+        at(positions) -> list: Items at given pool positions.
+        discard_at(positions) -> None: Removes items at given pool positions.
+    """
+
+    def __init__(self, items: Iterable[T] = (), capacity: int = 64) -> None:
+        self._items: np.ndarray = np.empty(capacity, dtype=object)
+        self._ids: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._position: np.ndarray = np.full(capacity, -1, dtype=np.int64)  # id -> pozycja lub -1
+        self._size: int = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item: Any) -> bool:
+        key = getattr(item, "id", None)
+        return key is not None and 0 <= key < len(self._position) and self._position[key] >= 0
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items[:self._size].tolist())
+
+    def __repr__(self) -> str:
+        return f"IdPool({self._items[:self._size].tolist()!r})"
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @staticmethod
+    def _grown(array: np.ndarray, size: int, fill: Any) -> np.ndarray:
+        capacity = len(array)
+        while capacity < size:
+            capacity *= 2
+        grown = np.full(capacity, fill, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add(self, item: T) -> None:
+        key = item.id
+        if key >= len(self._position):
+            self._position = self._grown(self._position, key + 1, -1)
+        elif self._position[key] >= 0:
+            return
+        if self._size == len(self._items):
+            self._items = self._grown(self._items, self._size + 1, None)
+            self._ids = self._grown(self._ids, self._size + 1, 0)
+        self._items[self._size] = item
+        self._ids[self._size] = key
+        self._position[key] = self._size
+        self._size += 1
+
+    def discard(self, item: T) -> None:
+        if item in self:
+            self.discard_at(self._position[item.id:item.id + 1])
+
+    def choice(self, rng=random) -> T:
+        """Return a random item (IndexError if empty)."""
+        if not self._size:
+            raise IndexError("Cannot choose from an empty pool")
+        return self._items[rng.randrange(self._size)]
+
+    def pop_random(self, rng=random) -> T:
+        """Remove and return a random item (IndexError if empty)."""
+        item = self.choice(rng)
+        self.discard(item)
+        return item
+
+    def at(self, positions: np.ndarray) -> List[T]:
+        """Return items at given positions (e.g. drawn with a numpy Generator from range(len(pool)))."""
+        return self._items[:self._size][positions].tolist()
+
+    def discard_at(self, positions: np.ndarray) -> None:
+        """
+        Remove items at given positions at once.
+
+        Removed places below the new size are filled with the surviving items
+        from the end of the pool, so positions of other items may change.
+
+        Args:
+            positions (np.ndarray): Distinct pool positions
+        """
+        positions = np.sort(positions)
+        if not len(positions):
+            return
+        size = self._size
+        keep = size - len(positions)
+        self._position[self._ids[positions]] = -1
+
+        # Dziury poniżej nowego rozmiaru wypełniają ocalałe elementy z końca
+        holes = positions[positions < keep]
+        tail = np.ones(size - keep, dtype=bool)
+        tail[positions[positions >= keep] - keep] = False
+        movers = keep + np.flatnonzero(tail)
+        self._items[holes] = self._items[movers]
+        self._ids[holes] = self._ids[movers]
+        self._position[self._ids[holes]] = holes
+
+        self._items[keep:size] = None
+        self._size = keep
@@ -0,0 +1,267 @@
+"""
+Typed, directed relationship store for the community simulation.
+
+Relations between humans are exposed as a networkx MultiDiGraph keyed by
+relation name, so one pair of humans can be connected by several relations
+at once (e.g. spouse and tribe member), and a directed relation such as
+'leader' (leader -> member) no longer overwrites its counterpart 'member'
+(member -> leader). Every relation has its own adjacency
+dictionaries, so neighbours of a given relation are found without filtering
+edges by attribute.
+
+The indexes are the source of truth and the only structures updated on
+add/remove, so changing relations costs a few set operations. The graph is
+built from them only when it is accessed and cached until the next change;
+it is a snapshot for drawing and analysis, not to be modified or kept
+across changes.
+
+Example:
+    >>> store = RelationStore()
+    >>> store.add("Mieszko", "Dobrawa", "spouse")
+    >>> store.add("Mieszko", "Dobrawa", "leader")
+    >>> store.add("Dobrawa", "Mieszko", "member")
+    >>> sorted(store.relations_between("Mieszko", "Dobrawa"))
+    ['leader', 'spouse']
+    >>> store.first("Dobrawa", "spouse"), store.first("Dobrawa", "member")
+    ('Mieszko', 'Mieszko')
+    >>> store.count("spouse")
+    1
+"""
+
+import gc
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, AbstractSet
+
+import networkx as nx
+import numpy as np
+
+_EMPTY: AbstractSet = frozenset()
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while many containers are created
+    (loading a checkpoint, a year of marriages); none of them are garbage,
+    and repeated full collections over all humans would take most of the time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class RelationStore:
+    """
+    Per-relation adjacency indexes with a MultiDiGraph view.
+
+    Attributes:
+        graph (nx.MultiDiGraph): Snapshot of all relations, edge key = relation name
+        symmetric (set[str]): Relations stored in both directions (e.g. 'spouse')
+
+    Methods:
+        add_nodes_from(nodes) -> None: Adds many nodes at once.
+        add(src, dst, relation) -> None: Adds a relation.
+        add_many(srcs, dsts, relation) -> None: Adds many relations of one type.
+        load_edges(relation, nodes, pairs) -> None: Sets all relations of one type at once.
+        remove(src, dst, relation) -> bool: Removes a relation.
+        has(src, dst, relation) -> bool: Checks a relation.
+        successors(node, relation) -> set: Targets of node's relations.
+        predecessors(node, relation) -> set: Sources of relations pointing at node.
+        first(node, relation) -> node | None: Any target (for 1:1 relations).
+        relations_between(src, dst) -> set[str]: Names of relations src -> dst.
+        count(relation) -> int: Number of relations of given type.
+        names() -> list[str]: Relation types used so far.
+        remove_node(node) -> None: Removes a node with all its relations.
+    """
+
+    def __init__(self, symmetric: Tuple[str, ...] = ("spouse",)) -> None:
+        self._graph: Optional[nx.MultiDiGraph] = None  # budowany przy odczycie, kasowany przy zmianie
+        self._nodes: Dict[Hashable, Dict[str, Any]] = {}
+        self.symmetric: Set[str] = set(symmetric)
+        self._out: Dict[str, Dict[Hashable, Set[Hashable]]] = {}
+        self._in: Dict[str, Dict[Hashable, Set[Hashable]]] = {}
+        self._counts: Dict[str, int] = {}
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        """Graph of all relations, built from the indexes when first read after a change."""
+        if self._graph is None:
+            graph = nx.MultiDiGraph()
+            graph.add_nodes_from(self._nodes.items())
+            graph.add_edges_from((src, dst, relation, {'relation': relation})
+                                 for relation in self._out for src, dst in self.edges(relation))
+            self._graph = graph
+        return self._graph
+
+    def add_node(self, node: Hashable, **attrs) -> None:
+        """Add node (with attributes shown in the graph)."""
+        self._nodes.setdefault(node, {}).update(attrs)
+        self._graph = None
+
+    def add_nodes_from(self, nodes: Iterable[Hashable], **attrs) -> None:
+        """Add many nodes at once."""
+        self._nodes.update((node, dict(attrs)) for node in nodes)
+        self._graph = None
+
+    def _add_directed(self, src: Hashable, dst: Hashable, relation: str) -> bool:
+        targets = self._out.setdefault(relation, {}).setdefault(src, set())
+        if dst in targets:
+            return False
+        targets.add(dst)
+        self._in.setdefault(relation, {}).setdefault(dst, set()).add(src)
+        self._graph = None
+        return True
+
+    def _remove_directed(self, src: Hashable, dst: Hashable, relation: str) -> bool:
+        out = self._out.get(relation, {})
+        targets = out.get(src)
+        if targets is None or dst not in targets:
+            return False
+        targets.discard(dst)
+        if not targets:
+            del out[src]
+        sources = self._in[relation][dst]
+        sources.discard(src)
+        if not sources:
+            del self._in[relation][dst]
+        self._graph = None
+        return True
+
+    def add(self, src: Hashable, dst: Hashable, relation: str) -> None:
+        """
+        Add relation src -> dst (both directions for symmetric relations).
+
+        Args:
+            src (Hashable): Source node
+            dst (Hashable): Target node
+            relation (str): Relation name, e.g. 'spouse', 'leader', 'father'
+        """
+        added = self._add_directed(src, dst, relation)
+        if relation in self.symmetric:
+            self._add_directed(dst, src, relation)
+        if added:
+            self._counts[relation] = self._counts.get(relation, 0) + 1
+
+    def add_many(self, srcs: Iterable[Hashable], dsts: Iterable[Hashable], relation: str) -> None:
+        """
+        Add relations srcs[i] -> dsts[i] of one type, e.g. all marriages of a year.
+
+        Same as calling add() for every pair, with the per-relation indexes
+        looked up once instead of once per edge.
+
+        Args:
+            srcs (Iterable[Hashable]): Source nodes
+            dsts (Iterable[Hashable]): Target nodes, paired with srcs
+            relation (str): Relation name
+        """
+        out = self._out.setdefault(relation, {})
+        into = self._in.setdefault(relation, {})
+        symmetric = relation in self.symmetric
+        added = 0
+        with gc_paused():
+            for src, dst in zip(srcs, dsts):
+                targets = out.setdefault(src, set())
+                known = len(targets)
+                targets.add(dst)
+                if len(targets) == known:
+                    continue
+                into.setdefault(dst, set()).add(src)
+                if symmetric:
+                    out.setdefault(dst, set()).add(src)
+                    into.setdefault(src, set()).add(dst)
+                added += 1
+        self._counts[relation] = self._counts.get(relation, 0) + added
+        self._graph = None
+
+    def load_edges(self, relation: str, nodes: Sequence[Hashable], pairs: np.ndarray) -> None:
+        """
+        Replace all relations of one type, e.g. when loading a checkpoint.
+
+        Pairs come from edges() (grouped by source, both directions of
+        symmetric relations), as indexes into nodes. Indexes are built with
+        one set per node instead of one insertion per edge.
+
+        Args:
+            relation (str): Relation name
+            nodes (Sequence[Hashable]): Nodes addressed by pairs (already added)
+            pairs (np.ndarray): (E, 2) array of node indexes, src -> dst
+        """
+        self._graph = None
+        pairs = np.asarray(pairs).reshape(-1, 2)
+        for column, index in ((0, self._out), (1, self._in)):
+            # Wyjściowe listy są już pogrupowane (kolejność źródeł jak w edges()), wejściowe trzeba posortować
+            order = np.arange(len(pairs)) if column == 0 else np.argsort(pairs[:, 1], kind='stable')
+            keys = pairs[order, column]
+            values = [nodes[i] for i in pairs[order, 1 - column].tolist()]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else keys
+            ends = np.r_[starts[1:], len(keys)].astype(np.intp)
+            index[relation] = {nodes[key]: set(values[start:end])
+                               for key, start, end in zip(keys[starts].tolist(), starts.tolist(), ends.tolist())}
+        self._counts[relation] = len(pairs) // 2 if relation in self.symmetric else len(pairs)
+
+    def remove(self, src: Hashable, dst: Hashable, relation: str) -> bool:
+        """
+        Remove relation src -> dst.
+
+        Returns:
+            bool: False if the relation did not exist
+        """
+        removed = self._remove_directed(src, dst, relation)
+        if relation in self.symmetric:
+            self._remove_directed(dst, src, relation)
+        if removed:
+            self._counts[relation] -= 1
+        return removed
+
+    def has(self, src: Hashable, dst: Hashable, relation: str) -> bool:
+        """Check if relation src -> dst exists."""
+        return dst in self._out.get(relation, {}).get(src, _EMPTY)
+
+    def successors(self, node: Hashable, relation: str) -> AbstractSet:
+        """Return targets of node's relations of given type (do not modify)."""
+        return self._out.get(relation, {}).get(node, _EMPTY)
+
+    def predecessors(self, node: Hashable, relation: str) -> AbstractSet:
+        """Return sources of relations of given type pointing at node (do not modify)."""
+        return self._in.get(relation, {}).get(node, _EMPTY)
+
+    def first(self, node: Hashable, relation: str) -> Optional[Hashable]:
+        """Return any target of node's relation, for relations with one target."""
+        targets = self._out.get(relation, {}).get(node)
+        return next(iter(targets)) if targets else None
+
+    def sources(self, relation: str) -> AbstractSet:
+        """Return all nodes with at least one outgoing relation of given type."""
+        return self._out.get(relation, {}).keys()
+
+    def edges(self, relation: str) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Iterate over (src, dst) pairs of given relation."""
+        for src, targets in self._out.get(relation, {}).items():
+            for dst in targets:
+                yield src, dst
+
+    def relations_between(self, src: Hashable, dst: Hashable) -> Set[str]:
+        """Return names of all relations src -> dst."""
+        return {relation for relation, out in self._out.items() if dst in out.get(src, _EMPTY)}
+
+    def count(self, relation: str) -> int:
+        """Return number of relations of given type (symmetric pairs count once)."""
+        return self._counts.get(relation, 0)
+
+    def names(self) -> List[str]:
+        """Return names of relation types used so far."""
+        return list(self._out)
+
+    def remove_node(self, node: Hashable) -> None:
+        """Remove node together with all relations it takes part in."""
+        for relation in list(self._out):
+            for dst in list(self.successors(node, relation)):
+                self.remove(node, dst, relation)
+            for src in list(self.predecessors(node, relation)):
+                self.remove(src, node, relation)
+        self._nodes.pop(node, None)
+        self._graph = None
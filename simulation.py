@@ -0,0 +1,340 @@
+"""
+Headless Community Simulation
+=============================
+
+SimulationEngine runs the yearly cycle of a Humanity (ageing and death,
+leader succession, tribe and family formation) without any drawing, so
+long runs with large populations can be measured. Everything else - statistics,
+logging, plotting - is attached as observers called every k years.
+Population, family and tribe counts are kept up to date from the events
+emitted by Humanity (events.EventStats), so statistics do not scan the
+graph; pass --events PATH to keep the whole event stream of a run on disk.
+
+Example Usage:
+-------------
+>>> engine = SimulationEngine(seed=1)
+>>> engine.initialize_population(1000)
+>>> stats = StatsObserver()
+>>> engine.add_observer(stats, every=10)
+>>> engine.step(years=30)
+>>> [row['year'] for row in stats.rows]
+[10, 20, 30]
+
+Saving and resuming:
+>>> import os, tempfile
+>>> with tempfile.TemporaryDirectory() as folder:
+...     path = os.path.join(folder, "world.ckpt")
+...     engine.save(path)
+...     resumed = SimulationEngine.load(path)
+>>> resumed.year, resumed.stats() == engine.stats()
+(30, True)
+
+Command line:
+    python simulation.py --population 50000 --years 500 --save world.ckpt
+    python simulation.py --resume world.ckpt --years 100
+    python simulation.py --years 200 --events run.events
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from environment import Environment
+from events import EventKind, EventLog, EventStats
+from human import Human
+from humanity import Humanity
+
+Observer = Callable[["SimulationEngine"], None]
+
+
+class SimulationEngine:
+    """
+    Yearly simulation loop of a community, independent of any GUI.
+
+    Attributes:
+        humanity (Humanity): Simulated community
+        year (int): Number of simulated years
+        population_history (list[int]): Population at start and after every year
+        leader_changes (list[tuple[Human, Human]]): (old, new) leaders of the last year
+        birth_rate (float): Yearly chance of a child for every married couple
+        people_updates (int): Sum of population over all simulated years
+        random (random.Random): 'simulation' stream of humanity.streams
+        event_stats (EventStats): Counts derived from humanity.events, updated every year
+        TRIBE_POPULATION (int): One tribe is wanted for every this many humans
+        LEADER_SHARE (float): Share of initial population created as potential leaders
+    """
+    TRIBE_POPULATION: int = 20
+    LEADER_SHARE: float = 0.3
+
+    def __init__(self,
+                 humanity: Optional[Humanity] = None,
+                 seed: Optional[int] = None,
+                 min_tribe_size: int = 15,
+                 leader_min_age: int = 45,
+                 birth_rate: float = 0.0) -> None:
+        """
+        Args:
+            humanity (Optional[Humanity]): Community to simulate. New one if None
+            seed (Optional[int]): Seed of the random streams of a new humanity
+            min_tribe_size (int): Minimum number of members of a new tribe
+            leader_min_age (int): Minimum age of a tribe leader
+            birth_rate (float): Yearly chance of a child for every married couple
+        """
+        self.humanity: Humanity = humanity if humanity is not None else Humanity(seed=seed)
+        self.humanity.MIN_TRIBE_SIZE = min_tribe_size
+        self.humanity.LEADER_MIN_AGE = leader_min_age
+        self.birth_rate: float = birth_rate
+        self.random: random.Random = self.humanity.streams.random("simulation")
+        self.year: int = 0
+        self.population_history: List[int] = []
+        self.leader_changes: List[Tuple[Human, Human]] = []
+        self.people_updates: int = 0
+        self.event_stats: EventStats = EventStats.of(self.humanity)
+        self._observers: List[Tuple[int, Observer]] = []
+
+    def add_observer(self, observer: Observer, every: int = 1) -> None:
+        """
+        Call observer(engine) after every `every` simulated years.
+
+        Args:
+            observer (Callable[[SimulationEngine], None]): Statistics, logging, plotting...
+            every (int): Period in years
+        """
+        self._observers.append((max(1, every), observer))
+
+    def remove_observer(self, observer: Observer) -> None:
+        """Stop calling observer."""
+        self._observers = [(every, o) for every, o in self._observers if o is not observer]
+
+    def initialize_population(self, initial_population: int) -> None:
+        """Create initial population with a larger share of potential leaders."""
+        humanity = self.humanity
+        rng = self.random
+        leaders_count = sum(rng.random() < self.LEADER_SHARE for _ in range(initial_population))
+        humanity.create_humans(initial_population - leaders_count)
+
+        # Młodszy wiek i wysokie cechy dla potencjalnych liderów
+        ages = [rng.randint(25, 40) for _ in range(leaders_count)]
+        leaders = humanity.create_humans(leaders_count, ages=ages)
+        rows = humanity.rows_of(leaders)
+        for trait in ('charisma', 'courage', 'intelligence'):
+            humanity.traits[rows, humanity.trait_index(trait)] = [
+                rng.uniform(0.7, 1.0) for _ in range(leaders_count)]
+        self.population_history.append(len(humanity.humans))
+        # Populacja początkowa może nie zmieścić się w buforze zdarzeń - liczniki od stanu
+        self.event_stats = EventStats.of(humanity)
+
+    def _succeed_leaders(self, dying: List[Human]) -> None:
+        """Pass tribes of dying leaders to their best living members."""
+        humanity = self.humanity
+        dead = set(dying)
+        for human in dying:
+            if not humanity.is_leader(human):
+                continue
+            new_leader = humanity.best_successor(human, exclude=dead)
+            if new_leader is not None:
+                humanity.transfer_leadership(human, new_leader)
+                self.leader_changes.append((human, new_leader))
+
+    def _births(self) -> None:
+        """Give a child to every married couple with probability birth_rate."""
+        humanity = self.humanity
+        fathers = [human for human in humanity.relations.sources('spouse') if human.gender == "male"]
+        for father in fathers:
+            if self.random.random() < self.birth_rate:
+                humanity.grow_family(father)
+
+    def simulate_year(self) -> None:
+        """Simulate one year: deaths, leader succession, births, new tribes and families."""
+        humanity = self.humanity
+        self.year += 1
+        self.leader_changes = []
+        self.people_updates += len(humanity.humans)
+
+        # Naturalna śmierć (wiek > MORTALITY_AGE)
+        dying = humanity.advance_year()
+        self._succeed_leaders(dying)
+        if not humanity.tribe_registry:
+            humanity.create_tribe()
+        humanity.remove_humans(dying)
+        if self.birth_rate > 0.0:
+            self._births()
+
+        population = len(humanity.humans)
+        if population >= humanity.MIN_TRIBE_SIZE:
+            desired_tribes = max(1, population // self.TRIBE_POPULATION)
+            if len(humanity.tribe_registry) < desired_tribes:
+                for _ in range(5):  # 5 prób
+                    humanity.create_tribe()
+
+        humanity.create_families(max(3, population // 6))
+        self.population_history.append(population)
+        self.event_stats.update(humanity.events)
+
+    def step(self, years: int = 1) -> None:
+        """
+        Simulate given number of years, calling observers when they are due.
+
+        Args:
+            years (int): Number of years to simulate
+        """
+        for _ in range(years):
+            self.simulate_year()
+            for every, observer in self._observers:
+                if self.year % every == 0:
+                    observer(self)
+
+    def save(self, path: str, environment: Optional[Environment] = None) -> None:
+        """
+        Save humanity, random streams and the engine's counters to a checkpoint.
+
+        Args:
+            path (str): Output file
+            environment (Optional[Environment]): Terrain to save with the community
+        """
+        save_checkpoint(path, self.humanity, environment, meta={'engine': {
+            'year': self.year,
+            'population_history': self.population_history,
+            'people_updates': self.people_updates,
+            'birth_rate': self.birth_rate,
+            'last_year': {kind.name: count for kind, count in self.event_stats.last_year.items()},
+        }})
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Checkpoint) -> "SimulationEngine":
+        """Create engine continuing the simulation saved in checkpoint (observers are not saved)."""
+        humanity = checkpoint.humanity
+        state = checkpoint.meta.get('engine', {})
+        engine = cls(humanity,
+                     min_tribe_size=humanity.MIN_TRIBE_SIZE,
+                     leader_min_age=humanity.LEADER_MIN_AGE,
+                     birth_rate=state.get('birth_rate', 0.0))
+        engine.year = state.get('year', 0)
+        engine.population_history = list(state.get('population_history', [len(humanity.humans)]))
+        engine.people_updates = state.get('people_updates', 0)
+        # Liczniki zdarzeń ostatniego roku (urodzenia, zgony...) - stan początkowy liczony od nowa
+        for name, count in state.get('last_year', {}).items():
+            engine.event_stats.last_year[EventKind[name]] = count
+        return engine
+
+    @classmethod
+    def load(cls, path: str) -> "SimulationEngine":
+        """Create engine from a checkpoint file saved by save()."""
+        return cls.from_checkpoint(load_checkpoint(path))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return summary statistics of the current year (counts derived from events)."""
+        humanity = self.humanity
+        events = self.event_stats
+        population = len(humanity.humans)
+        return {
+            'year': self.year,
+            'population': population,
+            'tribes': events.tribes,
+            'families': events.families,
+            'births': events.last_year[EventKind.BIRTH],
+            'deaths': events.last_year[EventKind.DEATH],
+            'marriages': events.last_year[EventKind.MARRIAGE],
+            'mean_age': float(humanity.ages[:population].mean()) if population else 0.0,
+        }
+
+
+class StatsObserver:
+    """Observer collecting SimulationEngine.stats() rows."""
+
+    def __init__(self) -> None:
+        self.rows: List[Dict[str, Any]] = []
+
+    def __call__(self, engine: SimulationEngine) -> None:
+        self.rows.append(engine.stats())
+
+
+class LogObserver:
+    """Observer printing a short summary of the year and leader changes."""
+
+    def __init__(self, print_func: Callable[[str], None] = print) -> None:
+        self.print = print_func
+
+    def __call__(self, engine: SimulationEngine) -> None:
+        for _, new_leader in engine.leader_changes:
+            self.print(f"Nowy lider plemienia: {new_leader.name}")
+        stats = engine.stats()
+        self.print(f"Rok {stats['year']}: populacja {stats['population']}, "
+                   f"plemiona {stats['tribes']}, rodziny {stats['families']}, "
+                   f"średni wiek {stats['mean_age']:.1f}")
+
+
+class ThroughputObserver:
+    """Observer printing years/second and people-updates/second since the last call."""
+
+    def __init__(self, print_func: Callable[[str], None] = print) -> None:
+        self.print = print_func
+        self._last: Optional[Tuple[float, int, int]] = None
+
+    def __call__(self, engine: SimulationEngine) -> None:
+        now = time.perf_counter()
+        if self._last is not None:
+            then, year, updates = self._last
+            elapsed = max(now - then, 1e-9)
+            self.print(f"Rok {engine.year}: {(engine.year - year) / elapsed:.1f} lat/s, "
+                       f"{(engine.people_updates - updates) / elapsed:,.0f} osób/s, "
+                       f"populacja {len(engine.humanity.humans)}")
+        self._last = (now, engine.year, engine.people_updates)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless community simulation benchmark")
+    parser.add_argument("--population", type=int, default=50_000, help="initial population")
+    parser.add_argument("--years", type=int, default=500, help="number of simulated years")
+    parser.add_argument("--birth-rate", type=float, default=0.05,
+                        help="yearly chance of a child for a married couple")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--report-every", type=int, default=50, help="years between reports")
+    parser.add_argument("--log", action="store_true", help="print yearly summaries")
+    parser.add_argument("--resume", metavar="PATH", help="continue from a checkpoint instead of a new population")
+    parser.add_argument("--save", metavar="PATH", help="save a checkpoint at the end")
+    parser.add_argument("--events", metavar="PATH", help="write all events of the run to a file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.resume:
+        engine = SimulationEngine.load(args.resume)
+        if args.events:  # w pliku tylko zdarzenia po punkcie kontrolnym
+            events = engine.humanity.events
+            engine.humanity.events = EventLog.from_records(events.since(events.oldest), events.total,
+                                                           events.year, events.capacity, path=args.events)
+        print(f"Wczytano rok {engine.year}: populacja {len(engine.humanity.humans)} "
+              f"({time.perf_counter() - start:.2f} s)")
+    else:
+        engine = SimulationEngine(seed=args.seed, birth_rate=args.birth_rate)
+        if args.events:
+            engine.humanity.events = EventLog(path=args.events)
+        engine.initialize_population(args.population)
+        print(f"Populacja początkowa: {args.population} ({time.perf_counter() - start:.2f} s), "
+              f"ziarno {engine.humanity.streams.entropy}")
+
+    throughput = ThroughputObserver()
+    throughput(engine)
+    engine.add_observer(throughput, every=args.report_every)
+    if args.log:
+        engine.add_observer(LogObserver())
+
+    start = time.perf_counter()
+    start_updates = engine.people_updates  # po wznowieniu licznik zawiera lata z punktu kontrolnego
+    engine.step(args.years)
+    elapsed = time.perf_counter() - start
+    print(f"Razem: {args.years} lat w {elapsed:.2f} s - {args.years / elapsed:.1f} lat/s, "
+          f"{(engine.people_updates - start_updates) / elapsed:,.0f} osób/s")
+    print(engine.stats())
+    engine.humanity.events.flush()
+
+    if args.save:
+        start = time.perf_counter()
+        engine.save(args.save)
+        print(f"Zapisano {args.save} ({time.perf_counter() - start:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Spatial index for entities placed on the world map.
+
+Entities are bucketed by chunk coordinates (the same (chunk_x, chunk_y) keys
+as Environment.chunk_cache), so proximity queries only look at the chunks
+overlapping the searched area instead of scanning every entity.
+
+Example:
+    >>> index = SpatialHash(cell_size=16)
+    >>> index.insert(0, 5, 5)
+    >>> index.insert(1, 40, 3)
+    >>> index.insert(2, 7, 9)
+    >>> index.query_radius(5, 5, 6).tolist()
+    [0, 2]
+    >>> index.nearest(38, 0, k=2).tolist()
+    [1, 0]
+"""
+
+from itertools import chain
+from typing import Dict, Iterable, Set, Tuple
+
+import numpy as np
+
+MANHATTAN = "manhattan"
+EUCLIDEAN = "euclidean"
+
+
+class SpatialHash:
+    """
+    Uniform grid of entity ids keyed by chunk coordinates.
+
+    Entity ids are non-negative integers (e.g. Character.id from a
+    CharacterPool); positions are kept in arrays indexed by id, and every
+    chunk keeps the set of ids currently inside it.
+
+    Attributes:
+        cell_size (int): Size of a grid cell in tiles (Environment.CHUNK_SIZE)
+        cells (dict[tuple[int, int], set[int]]): Entity ids in each chunk
+        xs, ys (np.ndarray): Last known position of every entity
+
+    Methods:
+        insert(entity, x, y) -> None: Adds an entity.
+        remove(entity) -> bool: Removes an entity.
+        move(entity, x, y) -> None: Updates position of an entity.
+        rebuild(ids, xs, ys) -> None: Replaces contents from position arrays.
+        query_radius(x, y, radius, metric) -> np.ndarray: Entities within distance.
+        query_rect(x0, y0, x1, y1) -> np.ndarray: Entities inside a rectangle.
+        nearest(x, y, k, metric) -> np.ndarray: k closest entities.
+    """
+
+    def __init__(self, cell_size: int = 16, capacity: int = 64) -> None:
+        self.cell_size: int = cell_size
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.xs: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.ys: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.present: np.ndarray = np.zeros(capacity, dtype=np.bool_)
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity: int) -> bool:
+        return 0 <= entity < len(self.present) and bool(self.present[entity])
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self.xs)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("xs", "ys", "present"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def cell_of(self, x: int, y: int) -> Tuple[int, int]:
+        """Return chunk coordinates containing tile (x, y)."""
+        return (x // self.cell_size, y // self.cell_size)
+
+    def insert(self, entity: int, x: int, y: int) -> None:
+        """Add entity at position (x, y), moving it if already indexed."""
+        if entity in self:
+            self.move(entity, x, y)
+            return
+        self._grow(entity + 1)
+        self.xs[entity] = x
+        self.ys[entity] = y
+        self.present[entity] = True
+        self.cells.setdefault(self.cell_of(x, y), set()).add(entity)
+        self._count += 1
+
+    def remove(self, entity: int) -> bool:
+        """Remove entity from the index. Returns False if it was not indexed."""
+        if entity not in self:
+            return False
+        key = self.cell_of(int(self.xs[entity]), int(self.ys[entity]))
+        bucket = self.cells[key]
+        bucket.discard(entity)
+        if not bucket:
+            del self.cells[key]
+        self.present[entity] = False
+        self._count -= 1
+        return True
+
+    def move(self, entity: int, x: int, y: int) -> None:
+        """Update position of an indexed entity."""
+        if entity not in self:
+            self.insert(entity, x, y)
+            return
+        old_key = self.cell_of(int(self.xs[entity]), int(self.ys[entity]))
+        new_key = self.cell_of(x, y)
+        self.xs[entity] = x
+        self.ys[entity] = y
+        if old_key == new_key:
+            return
+
+        bucket = self.cells[old_key]
+        bucket.discard(entity)
+        if not bucket:
+            del self.cells[old_key]
+        self.cells.setdefault(new_key, set()).add(entity)
+
+    def track(self, character) -> None:
+        """
+        Index a pooled Character and keep it updated on move() and jump().
+
+        Args:
+            character (Character): Character with id assigned by a CharacterPool
+        """
+        if character.id is None:
+            raise ValueError("Character must belong to a CharacterPool to be tracked")
+        character.spatial_index = self
+        self.insert(character.id, character.x, character.y)
+
+    def rebuild(self, ids: Iterable[int], xs: Iterable[int], ys: Iterable[int]) -> None:
+        """
+        Replace index contents with entities at given positions.
+
+        Args:
+            ids (Iterable[int]): Entity ids (unique)
+            xs (Iterable[int]): X positions
+            ys (Iterable[int]): Y positions
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+
+        self.cells = {}
+        self.present[:] = False
+        self._count = len(ids)
+        if not len(ids):
+            return
+
+        self._grow(int(ids.max()) + 1)
+        self.xs[ids] = xs
+        self.ys[ids] = ys
+        self.present[ids] = True
+
+        cx = xs // self.cell_size
+        cy = ys // self.cell_size
+        order = np.lexsort((cy, cx))
+        cx, cy, ids = cx[order], cy[order], ids[order]
+        starts = np.flatnonzero(np.r_[True, (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])])
+        ends = np.r_[starts[1:], len(ids)]
+        for start, end, key_x, key_y in zip(starts.tolist(), ends.tolist(),
+                                            cx[starts].tolist(), cy[starts].tolist()):
+            self.cells[(key_x, key_y)] = set(ids[start:end].tolist())
+
+    def _gather(self, keys: Iterable[Tuple[int, int]]) -> np.ndarray:
+        cells = self.cells
+        buckets = [cells[key] for key in keys if key in cells]
+        count = sum(len(bucket) for bucket in buckets)
+        return np.fromiter(chain.from_iterable(buckets), dtype=np.int64, count=count)
+
+    def _distances(self, ids: np.ndarray, x: int, y: int, metric: str) -> np.ndarray:
+        dx = self.xs[ids] - x
+        dy = self.ys[ids] - y
+        if metric == MANHATTAN:
+            return np.abs(dx) + np.abs(dy)
+        if metric == EUCLIDEAN:
+            return np.hypot(dx, dy)
+        raise ValueError(f"Unknown metric: {metric}")
+
+    def _cells_in_rect(self, x0: int, y0: int, x1: int, y1: int):
+        cx0, cy0 = self.cell_of(x0, y0)
+        cx1, cy1 = self.cell_of(x1, y1)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # Obszar większy niż liczba zajętych chunków - filtrujemy klucze
+            return [key for key in self.cells
+                    if cx0 <= key[0] <= cx1 and cy0 <= key[1] <= cy1]
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def query_rect(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        Get entities inside rectangle with inclusive corners (x0, y0) and (x1, y1).
+
+        Returns:
+            np.ndarray: Sorted entity ids
+        """
+        ids = self._gather(self._cells_in_rect(x0, y0, x1, y1))
+        xs, ys = self.xs[ids], self.ys[ids]
+        mask = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        return np.sort(ids[mask])
+
+    def query_radius(self, x: int, y: int, radius: float, metric: str = MANHATTAN) -> np.ndarray:
+        """
+        Get entities within distance from (x, y).
+
+        Args:
+            x (int): X coordinate of the center
+            y (int): Y coordinate of the center
+            radius (float): Maximum distance (inclusive)
+            metric (str): "manhattan" (as HumanBody.distance) or "euclidean"
+
+        Returns:
+            np.ndarray: Sorted entity ids
+        """
+        r = int(np.floor(radius))
+        ids = self._gather(self._cells_in_rect(x - r, y - r, x + r, y + r))
+        return np.sort(ids[self._distances(ids, x, y, metric) <= radius])
+
+    @staticmethod
+    def _closest(candidates: np.ndarray, distances: np.ndarray, k: int) -> np.ndarray:
+        return candidates[np.lexsort((candidates, distances))[:k]]
+
+    def nearest(self, x: int, y: int, k: int = 1, metric: str = MANHATTAN) -> np.ndarray:
+        """
+        Get k entities closest to (x, y), searching rings of chunks outwards.
+
+        When the rings searched so far span more chunks than are occupied
+        (the point is far from a sparse population), the occupied chunks are
+        scanned directly instead, so the cost never grows with the distance.
+
+        Returns:
+            np.ndarray: Entity ids ordered by distance (fewer than k if index is smaller)
+        """
+        k = min(k, self._count)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        cx, cy = self.cell_of(x, y)
+        found = []
+        seen = 0
+        ring = 0
+        while (2 * ring + 1) ** 2 <= len(self.cells):
+            if ring == 0:
+                keys = [(cx, cy)]
+            else:
+                keys = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+                keys += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+                keys += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+                keys += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+            ids = self._gather(keys)
+            if len(ids):
+                found.append(ids)
+                seen += len(ids)
+
+            # Chunki w kolejnym pierścieniu są oddalone o co najmniej ring * cell_size
+            if seen >= k:
+                candidates = np.concatenate(found)
+                distances = self._distances(candidates, x, y, metric)
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= ring * self.cell_size or seen == self._count:
+                    return self._closest(candidates, distances, k)
+            ring += 1
+
+        # Pierścienie objęły więcej komórek niż jest zajętych chunków - przeszukujemy wszystkie
+        candidates = self._gather(self.cells)
+        return self._closest(candidates, self._distances(candidates, x, y, metric), k)
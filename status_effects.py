@@ -0,0 +1,244 @@
+"""
+Timed status effects driven by a game tick.
+
+Instead of scanning every character's status dictionary on every tick, the
+StatusEngine keeps expiry times in a min-heap keyed by game tick, so the cost
+of a tick depends only on the effects that tick or expire, not on the number
+of characters.
+
+Example:
+    >>> engine = StatusEngine()
+    >>> poison = engine.register("poison", on_tick=lambda ids: print("poison", ids.tolist()),
+    ...                          on_expire=lambda entity, name: print("expired", entity, name))
+    >>> engine.apply(7, "poison", 2)
+    >>> engine.step()
+    poison [7]
+    []
+    >>> engine.step()
+    poison [7]
+    expired 7 poison
+    [(7, 'poison')]
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class StatusEffect:
+    """
+    Registered type of status effect.
+
+    Attributes:
+        name (str): Name of the effect (same as key in Character.status)
+        on_tick (Callable | None): Called once per tick with array of affected entity ids
+        on_expire (Callable | None): Called with (entity, name) when the effect runs out
+    """
+    name: str
+    on_tick: Optional[Callable[[np.ndarray], None]] = None
+    on_expire: Optional[Callable[[int, str], None]] = None
+
+
+class StatusEngine:
+    """
+    Scheduler of timed status effects for many entities.
+
+    Entities are identified by integer ids (for example Character.id from a
+    CharacterPool). Every active effect has an expiry tick stored in a heap;
+    refreshing or removing an effect leaves its old heap entry behind, which
+    is skipped when popped (lazy invalidation).
+
+    Attributes:
+        tick (int): Current game tick
+        effects (dict[str, StatusEffect]): Registered effect types
+
+    Methods:
+        register(name, on_tick, on_expire) -> StatusEffect:
+            Registers a type of effect with its callbacks.
+
+        apply(entity, name, duration) -> None:
+            Starts or refreshes an effect for given number of ticks.
+
+        change(entity, name, value) -> None:
+            Modifies remaining duration of an active effect.
+
+        remove(entity, name) -> bool:
+            Cancels an effect without calling its expiry callback.
+
+        remaining(entity, name) -> int | None:
+            Returns ticks left for an effect.
+
+        get_status(entity) -> dict[str, int]:
+            Returns all active effects of an entity in Character.status format.
+
+        step(ticks) -> list[tuple[int, str]]:
+            Advances time, runs per-tick effects and returns expired effects.
+    """
+
+    def __init__(self, tick: int = 0) -> None:
+        self.tick: int = tick
+        self.effects: Dict[str, StatusEffect] = {}
+        self._heap: List[Tuple[int, int, int, str]] = []
+        self._active: Dict[int, Dict[str, Tuple[int, int]]] = {}
+        self._ticking: Dict[str, Dict[int, None]] = {}
+        self._ticking_ids: Dict[str, np.ndarray] = {}
+        self._seq: int = 0
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def register(self,
+                 name: str,
+                 on_tick: Optional[Callable[[np.ndarray], None]] = None,
+                 on_expire: Optional[Callable[[int, str], None]] = None) -> StatusEffect:
+        """
+        Register a type of status effect.
+
+        Args:
+            name (str): Effect name
+            on_tick (Callable | None): Batch callback run every tick with ids of affected entities
+            on_expire (Callable | None): Callback run with (entity, name) on expiry
+
+        Returns:
+            StatusEffect: Registered effect
+        """
+        effect = StatusEffect(name, on_tick, on_expire)
+        self.effects[name] = effect
+        self._ticking_ids.pop(name, None)
+        if on_tick is None:
+            self._ticking.pop(name, None)
+        elif name not in self._ticking:
+            # Efekt mógł być już nałożony przed rejestracją - tykają też aktywne byty
+            self._ticking[name] = {entity: None for entity, statuses in self._active.items()
+                                   if name in statuses}
+        return effect
+
+    def _schedule(self, entity: int, name: str, expires: int) -> None:
+        self._seq += 1
+        statuses = self._active.setdefault(entity, {})
+        if name not in statuses:
+            self._count += 1
+        statuses[name] = (expires, self._seq)
+        heapq.heappush(self._heap, (expires, self._seq, entity, name))
+        if len(self._heap) > 64 and len(self._heap) > 2 * self._count:
+            self._compact()
+
+        ticking = self._ticking.get(name)
+        if ticking is not None and entity not in ticking:
+            ticking[entity] = None
+            self._ticking_ids.pop(name, None)
+
+    def _compact(self) -> None:
+        """Drop stale heap entries left by refreshed or removed effects."""
+        self._heap = [(expires, seq, entity, name)
+                      for entity, statuses in self._active.items()
+                      for name, (expires, seq) in statuses.items()]
+        heapq.heapify(self._heap)
+
+    def _discard(self, entity: int, name: str) -> None:
+        statuses = self._active[entity]
+        del statuses[name]
+        self._count -= 1
+        if not statuses:
+            del self._active[entity]
+
+        ticking = self._ticking.get(name)
+        if ticking is not None:
+            del ticking[entity]
+            self._ticking_ids.pop(name, None)
+
+    def apply(self, entity: int, name: str, duration: int) -> None:
+        """
+        Start an effect or replace remaining duration of an active one.
+
+        Args:
+            entity (int): Entity id
+            name (str): Effect name
+            duration (int): Number of ticks the effect lasts
+        """
+        if duration <= 0:
+            self.remove(entity, name)
+            return
+        self._schedule(entity, name, self.tick + duration)
+
+    def change(self, entity: int, name: str, value: int) -> None:
+        """
+        Modify remaining duration of an active effect, like Character.change_status.
+
+        Args:
+            entity (int): Entity id
+            name (str): Effect name
+            value (int): Number of ticks to add (negative to shorten)
+        """
+        left = self.remaining(entity, name)
+        if left is None:
+            return
+        # Skrócenie do zera wygasza efekt w najbliższym ticku
+        self._schedule(entity, name, self.tick + max(0, left + value))
+
+    def remove(self, entity: int, name: str) -> bool:
+        """
+        Cancel an effect without calling its expiry callback.
+
+        Returns:
+            bool: True if the effect was active
+        """
+        if name not in self._active.get(entity, {}):
+            return False
+        self._discard(entity, name)
+        return True
+
+    def remaining(self, entity: int, name: str) -> Optional[int]:
+        """Return number of ticks left for an effect, or None if not active."""
+        try:
+            expires, _ = self._active[entity][name]
+        except KeyError:
+            return None
+        return expires - self.tick
+
+    def get_status(self, entity: int) -> Dict[str, int]:
+        """Return active effects of entity as a name -> remaining duration dict."""
+        return {name: expires - self.tick
+                for name, (expires, _) in self._active.get(entity, {}).items()}
+
+    def step(self, ticks: int = 1) -> List[Tuple[int, str]]:
+        """
+        Advance time, applying per-tick effects and expiring finished ones.
+
+        Args:
+            ticks (int): Number of ticks to advance
+
+        Returns:
+            List[Tuple[int, str]]: (entity, name) of effects that expired
+        """
+        expired: List[Tuple[int, str]] = []
+        for _ in range(ticks):
+            self.tick += 1
+
+            for name, entities in self._ticking.items():
+                if not entities:
+                    continue
+                ids = self._ticking_ids.get(name)
+                if ids is None:
+                    ids = np.fromiter(entities, dtype=np.int64, count=len(entities))
+                    self._ticking_ids[name] = ids
+                self.effects[name].on_tick(ids)
+
+            heap = self._heap
+            while heap and heap[0][0] <= self.tick:
+                _, seq, entity, name = heapq.heappop(heap)
+                current = self._active.get(entity, {}).get(name)
+                if current is None or current[1] != seq:
+                    continue  # wpis nieaktualny - efekt odświeżony lub usunięty
+
+                self._discard(entity, name)
+                expired.append((entity, name))
+                effect = self.effects.get(name)
+                if effect is not None and effect.on_expire is not None:
+                    effect.on_expire(entity, name)
+
+        return expired
@@ -0,0 +1,246 @@
+"""
+Parallel Parameter Sweep
+========================
+
+Runs many independent headless simulations (SimulationEngine) for every
+combination of Humanity settings - e.g. MIN_TRIBE_SIZE, LEADER_MIN_AGE,
+PARENTS_AGE or the mortality curve (MORTALITY_AGE, MORTALITY_SCALE) - spread
+over a ProcessPoolExecutor. Every run draws from its own RandomStreams
+spawned from one seed; replicate i of every combination uses the same
+streams (common random numbers), so differences between settings are not
+hidden by noise, and results do not depend on the number of workers.
+
+Workers send back only yearly summary series (population, tribes,
+families, births, deaths) as small numpy arrays, never the community
+itself. Results of one combination are stacked into (runs, years + 1)
+arrays and summarised with percentile bands and confidence intervals of
+the mean.
+
+Example Usage:
+-------------
+>>> results = sweep({'LEADER_MIN_AGE': [25, 45]}, runs=4, population=500, years=20, seed=1)
+>>> [result.params for result in results]
+[{'LEADER_MIN_AGE': 25}, {'LEADER_MIN_AGE': 45}]
+>>> low, median, high = results[0].band('population')
+>>> results[0].series['population'].shape, bool((low <= high).all())
+((4, 21), True)
+
+Command line:
+    python sweep.py --population 2000 --years 200 --runs 16 \\
+        --param MIN_TRIBE_SIZE=5,15 --param MORTALITY_AGE=50,60,70
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from events import EventKind
+from humanity import Humanity
+from rng import RandomStreams
+from simulation import SimulationEngine
+
+# Serie zbierane co rok w każdym przebiegu
+METRICS = ('population', 'tribes', 'families', 'births', 'deaths')
+
+
+@dataclass
+class SweepResult:
+    """
+    Yearly series of all runs of one combination of settings.
+
+    Attributes:
+        params (dict): Humanity settings of the runs
+        series (dict[str, np.ndarray]): Metric -> (runs, years + 1) array; column 0 is the initial state
+        seconds (float): Total computing time of the runs
+    """
+    params: Dict[str, Any]
+    series: Dict[str, np.ndarray]
+    seconds: float = 0.0
+
+    @property
+    def runs(self) -> int:
+        return len(self.series['population'])
+
+    def mean(self, metric: str) -> np.ndarray:
+        """Yearly mean of metric over runs."""
+        return self.series[metric].mean(axis=0)
+
+    def band(self, metric: str, level: float = 0.9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Yearly percentile band of metric over runs.
+
+        Args:
+            metric (str): One of METRICS
+            level (float): Share of runs inside the band
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (low, median, high)
+        """
+        tail = (1.0 - level) / 2 * 100
+        low, median, high = np.percentile(self.series[metric], [tail, 50, 100 - tail], axis=0)
+        return low, median, high
+
+    def interval(self, metric: str, level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Yearly confidence interval of the mean of metric (normal approximation).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (low, high)
+        """
+        values = self.series[metric]
+        mean = values.mean(axis=0)
+        if len(values) < 2:
+            return mean, mean
+        error = values.std(axis=0, ddof=1) / np.sqrt(len(values))
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        return mean - z * error, mean + z * error
+
+
+def _summary(engine: SimulationEngine) -> List[int]:
+    """Values of METRICS after the last simulated year (counts derived from events)."""
+    events = engine.event_stats
+    return [events.population, events.tribes, events.families,
+            events.last_year[EventKind.BIRTH], events.last_year[EventKind.DEATH]]
+
+
+def run_simulation(params: Dict[str, Any],
+                   seed: np.random.SeedSequence,
+                   population: int,
+                   years: int,
+                   birth_rate: float) -> Dict[str, np.ndarray]:
+    """
+    Run one simulation and return its yearly summary (called in a worker process).
+
+    Args:
+        params (dict): Humanity settings (class constants) overridden for this run
+        seed (np.random.SeedSequence): Root of the run's random streams
+        population (int): Initial population
+        years (int): Number of simulated years
+        birth_rate (float): Yearly chance of a child for every married couple
+
+    Returns:
+        dict[str, np.ndarray]: Metric -> (years + 1,) int64 array
+    """
+    engine = SimulationEngine(Humanity(streams=RandomStreams(seed)), birth_rate=birth_rate)
+    for name, value in params.items():
+        setattr(engine.humanity, name, value)
+    engine.initialize_population(population)
+
+    series = np.zeros((len(METRICS), years + 1), dtype=np.int64)
+    series[:, 0] = _summary(engine)
+    for year in range(1, years + 1):
+        engine.step()
+        series[:, year] = _summary(engine)
+    return dict(zip(METRICS, series))
+
+
+def _check_params(grid: Dict[str, Sequence[Any]]) -> None:
+    for name in grid:
+        if not name.isupper() or not hasattr(Humanity, name):
+            raise ValueError(f"Unknown Humanity setting: {name}")
+
+
+def _run(task: Tuple[Dict[str, Any], np.random.SeedSequence, int, int, float]) -> Tuple[Dict[str, np.ndarray], float]:
+    start = time.perf_counter()
+    return run_simulation(*task), time.perf_counter() - start
+
+
+def sweep(grid: Dict[str, Sequence[Any]],
+          runs: int = 8,
+          population: int = 1000,
+          years: int = 100,
+          birth_rate: float = 0.05,
+          seed: Optional[int] = None,
+          workers: Optional[int] = None) -> List[SweepResult]:
+    """
+    Run `runs` simulations for every combination of settings in grid.
+
+    Args:
+        grid (dict[str, Sequence]): Humanity setting -> values to try (e.g. {'MIN_TRIBE_SIZE': [5, 15]})
+        runs (int): Simulations per combination
+        population (int): Initial population of every run
+        years (int): Simulated years of every run
+        birth_rate (float): Yearly chance of a child for every married couple
+        seed (Optional[int]): Root seed of all runs. Fresh OS entropy if None
+        workers (Optional[int]): Worker processes. All CPUs if None; 1 runs in this process
+
+    Returns:
+        List[SweepResult]: One result per combination, in order of itertools.product(grid)
+
+    Raises:
+        ValueError: If grid names a setting Humanity does not have
+    """
+    _check_params(grid)
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    seeds = np.random.SeedSequence(seed).spawn(runs)
+    tasks = [(params, run_seed, population, years, birth_rate)
+             for params in combinations for run_seed in seeds]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        outputs = [_run(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            outputs = list(executor.map(_run, tasks))
+
+    results = []
+    for index, params in enumerate(combinations):
+        chunk = outputs[index * runs:(index + 1) * runs]
+        series = {metric: np.stack([output[metric] for output, _ in chunk]) for metric in METRICS}
+        results.append(SweepResult(params, series, sum(seconds for _, seconds in chunk)))
+    return results
+
+
+def _parse_param(text: str) -> Tuple[str, List[Any]]:
+    """Parse NAME=v1,v2,... into typed values (int, else float, else str)."""
+    name, _, values = text.partition("=")
+    parsed = []
+    for value in values.split(","):
+        for cast in (int, float, str):
+            try:
+                parsed.append(cast(value))
+                break
+            except ValueError:
+                continue
+    return name.strip(), parsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep of community simulations")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2",
+                        help="Humanity setting and values to try (repeatable)")
+    parser.add_argument("--runs", type=int, default=8, help="simulations per combination")
+    parser.add_argument("--population", type=int, default=1000, help="initial population")
+    parser.add_argument("--years", type=int, default=100, help="number of simulated years")
+    parser.add_argument("--birth-rate", type=float, default=0.05,
+                        help="yearly chance of a child for a married couple")
+    parser.add_argument("--seed", type=int, default=None, help="root random seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--level", type=float, default=0.9, help="share of runs inside printed bands")
+    args = parser.parse_args(argv)
+
+    grid = dict(_parse_param(text) for text in args.param)
+    start = time.perf_counter()
+    results = sweep(grid, runs=args.runs, population=args.population, years=args.years,
+                    birth_rate=args.birth_rate, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    cpu = sum(result.seconds for result in results)
+    print(f"{len(results) * args.runs} przebiegów w {elapsed:.2f} s (czas obliczeń {cpu:.2f} s)")
+
+    for result in results:
+        print(result.params or "domyślne ustawienia")
+        for metric in METRICS:
+            low, median, high = (values[-1] for values in result.band(metric, args.level))
+            print(f"  {metric:>10}: {median:10.1f}  [{low:.1f}, {high:.1f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,27 @@
 import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
 from humanity import Humanity
+from simulation import SimulationEngine
+from layout import SocietyLayout
 from matplotlib.gridspec import GridSpec
-import random
 from matplotlib.widgets import Button
+from matplotlib.collections import LineCollection
+
+# Styl krawędzi dla każdego typu relacji: (kolor, styl, grubość)
+EDGE_STYLES = {
+    'leader': ('#FF0000', 'solid', 4),
+    'member': ('#4169E1', 'dashed', 2),
+    'spouse': ('#FF69B4', 'solid', 3),
+    'father': ('#228B22', 'solid', 2),
+    'mother': ('#9370DB', 'solid', 2)
+}
+LABEL_LIMIT = 60  # powyżej tej liczby ludzi podpisywani są tylko liderzy
 
 class Simulation:
     def __init__(self):
-        self.humanity = Humanity()
-        self.humanity.MIN_TRIBE_SIZE = 15
-        self.humanity.LEADER_MIN_AGE = 45
-        self.year = 0
-        self.population_history = []
+        # Logika symulacji jest w SimulationEngine, tutaj tylko wyświetlanie
+        self.engine = SimulationEngine(min_tribe_size=15, leader_min_age=45)
+        self.layout = SocietyLayout()
         
         # Konfiguracja okna
         plt.ion()
@@ -30,6 +40,20 @@ class Simulation:
         self.button = Button(self.ax_button, 'Następny rok')
         self.button.on_clicked(self.on_button_click)
         
+        self.init_society_artists()
+        
+    @property
+    def humanity(self) -> Humanity:
+        return self.engine.humanity
+
+    @property
+    def year(self) -> int:
+        return self.engine.year
+
+    @property
+    def population_history(self):
+        return self.engine.population_history
+
     def run(self):
         """Uruchamia symulację i utrzymuje okno otwarte"""
         # Inicjalizacja wyświetlania
@@ -60,171 +84,101 @@ class Simulation:
                 print(f"  Plemię {i}: {tribe['leader'].name} (Członków: {len(tribe['members'])})")
         
         # Informacje o rodzinach
-        families = sum(1 for h in self.humanity.humans 
-                      if any(data.get("relation") == "spouse" 
-                            for _, _, data in self.humanity.graph.edges(h, data=True))) / 2
-        print(f"\nLiczba rodzin: {int(families)}")
+        families = self.engine.event_stats.families
+        print(f"\nLiczba rodzin: {families}")
         
         print("-" * 40)
 
     def initialize_population(self, initial_population: int):
         """Inicjalizacja z większą liczbą potencjalnych liderów"""
-        for _ in range(initial_population):
-            self.humanity.create_human()
-            # Zwiększamy szansę na stworzenie potencjalnego lidera
-            if random.random() < 0.3:  # 30% szans
-                last_human = self.humanity.humans[-1]
-                last_human.charisma = random.uniform(0.7, 1.0)
-                last_human.courage = random.uniform(0.7, 1.0)
-                last_human.intelligence = random.uniform(0.7, 1.0)
-                last_human.age = random.randint(25, 40)  # Młodszy wiek dla potencjalnych liderów
-        self.population_history.append(len(self.humanity.humans))
-        
+        self.engine.initialize_population(initial_population)
         
     def simulate_year(self):
-        self.year += 1
-        existing_tribes = self.humanity.get_all_tribes()
-        
-        # Naturalna śmierć ze zmniejszoną śmiertelnością
-        to_remove = []
-        for human in self.humanity.humans:
-            human.age += 1
-            death_chance = 0
-            if human.age > 60:  # Zwiększamy próg śmiertelności
-                death_chance = (human.age - 60) / 200  # Znacznie zmniejszona śmiertelność
-            if random.random() < death_chance:
-                to_remove.append(human)
-
-        # Sprawdź czy usuwany człowiek jest liderem i znajdź zastępcę
-        for human in to_remove:
-            # Sprawdź czy jest liderem
-            is_leader = any(data.get('relation') == 'leader' 
-                        for _, _, data in self.humanity.graph.edges(human, data=True))
-            
-            if is_leader:
-                # Znajdź plemię tego lidera
-                for tribe in existing_tribes:
-                    if tribe['leader'] == human:
-                        # Znajdź nowego lidera wśród członków
-                        potential_leaders = [
-                            member for member in tribe['members']
-                            if member.age >= self.humanity.LEADER_MIN_AGE
-                            and member.charisma >= 0.6
-                            and member not in to_remove
-                        ]
-                        
-                        if potential_leaders:
-                            # Wybierz nowego lidera
-                            new_leader = max(potential_leaders,
-                                        key=lambda h: h.charisma + h.courage + h.intelligence)
-                            
-                            # Usuń stare relacje lidera
-                            edges_to_remove = []
-                            for u, v, d in self.humanity.graph.edges(human, data=True):
-                                if d.get('relation') in ['leader', 'member']:
-                                    edges_to_remove.append((u, v))
-                            
-                            for edge in edges_to_remove:
-                                self.humanity.graph.remove_edge(*edge)
-                            
-                            # Dodaj nowe relacje z nowym liderem
-                            for member in tribe['members']:
-                                if member != new_leader and member not in to_remove:
-                                    self.humanity.graph.add_edge(new_leader, member, relation='leader')
-                                    self.humanity.graph.add_edge(member, new_leader, relation='member')
-                            
-                            print(f"Nowy lider plemienia: {new_leader.name}")
-                        break
-        if len(self.humanity.get_all_tribes()) == 0:
-            new_tribe = self.humanity.create_tribe()
-        # Usuwanie zmarłych
-        for human in to_remove:
-            self.humanity.humans.remove(human)
-            self.humanity.graph.remove_node(human)
-
-        population = len(self.humanity.humans)
-        if population >= self.humanity.MIN_TRIBE_SIZE:
-            # Sprawdź liczbę istniejących plemion
-            current_tribes = len(self.humanity.get_all_tribes())
-            desired_tribes = max(1, population // 20)  # Jeden przywódca na każde 20 osób
-            
-            if current_tribes < desired_tribes:
-                # Zwiększona liczba prób utworzenia plemienia
-                for _ in range(5):  # 5 prób
-                    new_tribe = self.humanity.create_tribe()
-
-
-        # Tworzenie nowych rodzin z większą częstotliwością
-        num_new_families = max(3, population // 6)  # Więcej rodzin
-        for _ in range(num_new_families):
-            self.humanity.create_family()
-
-        self.population_history.append(population)
-
-    def update_society_graph(self):
-        self.ax_society.clear()
-        G = self.humanity.graph
+        self.engine.step()
+        for _, new_leader in self.engine.leader_changes:
+            print(f"Nowy lider plemienia: {new_leader.name}")
+
+    def init_society_artists(self):
+        """Tworzy artystów widoku społeczeństwa raz - później zmieniane są tylko ich dane"""
+        ax = self.ax_society
+        self.edge_artists = {}
+        for relation, (color, style, width) in EDGE_STYLES.items():
+            lines = LineCollection([], colors=color, linestyles=style, linewidths=width, zorder=1)
+            ax.add_collection(lines)
+            self.edge_artists[relation] = lines
+        self.link_artist = LineCollection([], colors='#999999', linewidths=1, zorder=1)
+        ax.add_collection(self.link_artist)
+        self.node_artist = ax.scatter(np.zeros(0), np.zeros(0), zorder=2)
+        self.label_artists = []
         
-        if len(G.nodes()) == 0:
-            self.ax_society.set_title("Brak ludzi w symulacji")
-            return
-
-        pos = nx.spring_layout(G, k=2, iterations=50)
-        
-        # Węzły
-        node_colors = []
-        node_sizes = []
-        for human in G.nodes():
-            if any(data.get('relation') == 'leader' for _, _, data in G.edges(human, data=True)):
-                node_colors.append('#FF0000')
-                node_sizes.append(1000)
-            elif any(data.get('relation') == 'member' for _, _, data in G.edges(human, data=True)):
-                node_colors.append('#4169E1')
-                node_sizes.append(500)
-            else:
-                node_colors.append('#32CD32')
-                node_sizes.append(300)
-
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, 
-                            node_size=node_sizes, ax=self.ax_society)
-
-        # Krawędzie - poprawiona wersja
-        edge_styles = {
-            'leader': ('#FF0000', 'solid', 4),
-            'member': ('#4169E1', 'dashed', 2),
-            'spouse': ('#FF69B4', 'solid', 3),
-            'father': ('#228B22', 'solid', 2),
-            'mother': ('#9370DB', 'solid', 2)
-        }
-
-        for relation, (color, style, width) in edge_styles.items():
-            edges = [(u, v) for (u, v, d) in G.edges(data=True) 
-                    if d.get('relation') == relation]
-            if edges:
-                nx.draw_networkx_edges(G, pos, 
-                                    edgelist=edges, 
-                                    edge_color=color,
-                                    style=style,
-                                    width=width,
-                                    ax=self.ax_society)
-
-        # Etykiety
-        labels = {human: f"{human.name}\n({human.age})" for human in G.nodes()}
-        nx.draw_networkx_labels(G, pos, labels, font_size=8, 
-                            font_weight='bold', ax=self.ax_society)
-
         # Legenda
         legend_elements = [
             plt.Line2D([0], [0], color=color, linestyle=style,
                     label=relation.capitalize(), linewidth=width) 
-            for relation, (color, style, width) in edge_styles.items()
+            for relation, (color, style, width) in EDGE_STYLES.items()
         ]
-        self.ax_society.legend(handles=legend_elements, loc='center left', 
-                            bbox_to_anchor=(1, 0.5), fontsize=10)
+        ax.legend(handles=legend_elements, loc='center left', 
+                  bbox_to_anchor=(1, 0.5), fontsize=10)
+        ax.axis('off')
+
+    def update_society_graph(self):
+        # Pozycje z poprzedniego roku + kilka iteracji; duży graf jako plemiona
+        view = self.layout.update(self.humanity)
+        positions = view.positions
+        count = len(view.nodes)
+        
+        for text in self.label_artists:
+            text.remove()
+        self.label_artists = []
+        
+        if count == 0:
+            self.node_artist.set_offsets(np.zeros((0, 2)))
+            for lines in [*self.edge_artists.values(), self.link_artist]:
+                lines.set_segments([])
+            self.ax_society.set_title("Brak ludzi w symulacji")
+            return
         
-        self.ax_society.set_title(f'Stan społeczeństwa - Rok {self.year}', 
-                                fontsize=12, pad=20)
-        self.ax_society.axis('off')
+        # Atrybuty węzłów jako tablice (węzły w kolejności wierszy Humanity)
+        colors = np.full(count, '#32CD32', dtype=object)
+        sizes = np.full(count, 300.0)
+        if view.aggregated:
+            colors[:-1] = '#FF0000'
+            sizes = 100 + 60 * view.sizes ** 0.5
+            labeled = np.arange(count)
+            labels = [
+                f"{tribe.name if tribe is not None else 'Bez plemienia'}\n({size})"
+                for tribe, size in zip(map(self.humanity.get_tribe, view.nodes), view.sizes.tolist())
+            ]
+            title = f'Plemiona - Rok {self.year} (populacja {int(view.sizes.sum())})'
+        else:
+            members = self.humanity.rows_of(self.humanity.relations.sources('member'))
+            leaders = self.humanity.rows_of(self.humanity.tribe_registry)
+            colors[members], sizes[members] = '#4169E1', 500
+            colors[leaders], sizes[leaders] = '#FF0000', 1000
+            # Podpisy tylko liderów, chyba że ludzi jest niewielu
+            labeled = np.arange(count) if count <= LABEL_LIMIT else leaders
+            labels = [f"{view.nodes[row].name}\n({view.nodes[row].age})" for row in labeled.tolist()]
+            title = f'Stan społeczeństwa - Rok {self.year}'
+        
+        self.node_artist.set_offsets(positions)
+        self.node_artist.set_facecolor(colors.tolist())
+        self.node_artist.set_sizes(sizes)
+        
+        # Jedna kolekcja linii na typ relacji
+        empty = np.zeros((0, 2), dtype=np.intp)
+        for relation, lines in self.edge_artists.items():
+            lines.set_segments(positions[view.edges.get(relation, empty)])
+        self.link_artist.set_segments(positions[view.edges.get('link', empty)])
+        
+        for (x, y), label in zip(positions[labeled], labels):
+            self.label_artists.append(self.ax_society.text(
+                x, y, label, fontsize=8, fontweight='bold', ha='center', va='center', zorder=3))
+        
+        margin = 0.1 * max(np.ptp(positions, axis=0).max(), 1.0)
+        self.ax_society.set_xlim(positions[:, 0].min() - margin, positions[:, 0].max() + margin)
+        self.ax_society.set_ylim(positions[:, 1].min() - margin, positions[:, 1].max() + margin)
+        self.ax_society.set_title(title, fontsize=12, pad=20)
+
     def update_statistics(self):
         # Historia populacji
         self.ax1.clear()
@@ -263,19 +217,16 @@ class Simulation:
 
         # Szczegółowe statystyki
         self.ax3.clear()
-        population = len(self.humanity.humans)
-        if population > 0:
-            avg_age = sum(h.age for h in self.humanity.humans) / population
-            num_families = sum(1 for h in self.humanity.humans 
-                             if any(data.get("relation") == "spouse" 
-                                   for _, _, data in self.humanity.graph.edges(h, data=True))) / 2
-            
+        stats = self.engine.stats()
+        if stats['population'] > 0:
             stats_text = (
                 f'Rok: {self.year}   |   '
-                f'Populacja: {population}   |   '
-                f'Plemiona: {len(tribes)}   |   '
-                f'Średni wiek: {avg_age:.1f}   |   '
-                f'Rodziny: {num_families:.0f}'
+                f'Populacja: {stats["population"]}   |   '
+                f'Plemiona: {stats["tribes"]}   |   '
+                f'Średni wiek: {stats["mean_age"]:.1f}   |   '
+                f'Rodziny: {stats["families"]}   |   '
+                f'Urodzenia: {stats["births"]}   |   '
+                f'Zgony: {stats["deaths"]}'
             )
             self.ax3.text(0.5, 0.5, stats_text, fontsize=12, 
                          ha='center', va='center')
@@ -0,0 +1,85 @@
+"""
+Benchmark indeksu przestrzennego (SpatialHash) dla 100 000 postaci.
+
+Porównuje zapytania o sąsiadów w siatce chunków z pełnym przeszukaniem
+wszystkich pozycji (O(N) na zapytanie) i sprawdza zgodność wyników.
+"""
+
+import time
+import numpy as np
+from spatial import SpatialHash, EUCLIDEAN, MANHATTAN
+
+ENTITIES = 100_000
+WORLD_SIZE = 4096
+QUERIES = 2_000
+RADIUS = 24
+
+
+def brute_radius(xs, ys, x, y, radius, metric):
+    if metric == MANHATTAN:
+        distances = np.abs(xs - x) + np.abs(ys - y)
+    else:
+        distances = np.hypot(xs - x, ys - y)
+    return np.flatnonzero(distances <= radius)
+
+
+def timed(label, func, count=1):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms  ({elapsed / count * 1e6:8.2f} µs/op)")
+    return result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    ids = np.arange(ENTITIES)
+    xs = rng.integers(0, WORLD_SIZE, ENTITIES)
+    ys = rng.integers(0, WORLD_SIZE, ENTITIES)
+    centers = rng.integers(0, WORLD_SIZE, (QUERIES, 2))
+
+    index = SpatialHash(cell_size=16)
+    timed("rebuild (100k)", lambda: index.rebuild(ids, xs, ys))
+
+    for metric in (MANHATTAN, EUCLIDEAN):
+        grid = timed(f"query_radius {metric} x{QUERIES}",
+                     lambda: [index.query_radius(x, y, RADIUS, metric) for x, y in centers],
+                     QUERIES)
+        brute = timed(f"brute force {metric} x{QUERIES}",
+                      lambda: [brute_radius(xs, ys, x, y, RADIUS, metric) for x, y in centers],
+                      QUERIES)
+        assert all(np.array_equal(a, b) for a, b in zip(grid, brute))
+
+    timed(f"query_rect 64x64 x{QUERIES}",
+          lambda: [index.query_rect(x, y, x + 63, y + 63) for x, y in centers], QUERIES)
+
+    knn = timed(f"nearest k=10 x{QUERIES}",
+                lambda: [index.nearest(x, y, 10, EUCLIDEAN) for x, y in centers], QUERIES)
+    for (x, y), found in zip(centers[:50], knn):
+        distances = np.hypot(xs - x, ys - y)
+        assert np.allclose(np.sort(distances[found]), np.sort(distances)[:10])
+
+    # Punkt daleko od wszystkich postaci - koszt nie może rosnąć z odległością
+    far = timed("nearest k=10 far away x10",
+                lambda: [index.nearest(10_000_000, -10_000_000, 10, EUCLIDEAN) for _ in range(10)], 10)
+    distances = np.hypot(xs - 10_000_000, ys + 10_000_000)
+    assert np.allclose(np.sort(distances[far[0]]), np.sort(distances)[:10])
+
+    sparse = SpatialHash(cell_size=16)
+    sparse.rebuild([0, 1, 2], [0, 5, 3000], [0, 7, 3000])
+    found = timed("nearest in sparse index far away",
+                  lambda: sparse.nearest(50_000_000, 50_000_000, 2))
+    assert found.tolist() == [2, 1]
+
+    steps = rng.integers(-1, 2, (ENTITIES, 2))
+
+    def move_all():
+        for entity, (dx, dy) in enumerate(steps.tolist()):
+            index.move(entity, int(xs[entity]) + dx, int(ys[entity]) + dy)
+
+    timed("incremental move (100k)", move_all, ENTITIES)
+    print(f"Indeksowanych postaci: {len(index)}, zajętych chunków: {len(index.cells)}")
+
+
+if __name__ == "__main__":
+    main()
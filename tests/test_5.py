@@ -0,0 +1,53 @@
+"""
+Benchmark tworzenia populacji: Humanity.create_humans kontra pętla create_human.
+
+Domyślnie tworzy 1 000 000 ludzi każdą z metod (liczbę można podać jako
+pierwszy argument) i porównuje czas oraz zgodność obu populacji.
+
+Uruchomienie:
+    PYTHONPATH=. python tests/test_5.py [liczba_ludzi]
+"""
+
+import sys
+import time
+import numpy as np
+from humanity import Humanity
+
+HUMANS = 1_000_000
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.2f} s  ({elapsed / count * 1e6:8.2f} µs/human)")
+    return result, elapsed
+
+
+def create_in_loop(world, count):
+    for _ in range(count):
+        world.create_human()
+    return world
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else HUMANS
+    print(f"Tworzenie {count} ludzi")
+
+    looped, loop_time = timed("create_human w pętli", lambda: create_in_loop(Humanity(seed=0), count), count)
+    batched, batch_time = timed("create_humans", lambda: Humanity(seed=0).create_humans(count) and None, count)
+    print(f"Przyspieszenie: {loop_time / batch_time:.1f}x")
+
+    world = Humanity(seed=0)
+    world.create_humans(count)
+    assert len(world.humans) == len(looped.humans) == count
+    assert world.graph.number_of_nodes() == count
+    ages = world.ages[:count]
+    assert ages.min() >= 10 and ages.max() <= 90
+    assert np.all((world.traits[:count] >= 0.0) & (world.traits[:count] < 1.0))
+    assert all(human._row == row for row, human in enumerate(world.humans))
+    print(f"Średni wiek: {ages.mean():.1f} (pętla: {looped.ages[:count].mean():.1f})")
+
+
+if __name__ == "__main__":
+    main()
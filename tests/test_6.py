@@ -0,0 +1,65 @@
+"""
+Benchmark pamięci: bajty na człowieka (tracemalloc) przy 100 000 ludzi.
+
+Mierzy zwykłe obiekty Human (ze __slots__ i leniwymi memory/future_plans),
+ten sam układ pól jako klasyczny dataclass ze słownikiem __dict__ (dla
+porównania) oraz całą populację Humanity (tablice, graf, pule).
+
+Uruchomienie:
+    PYTHONPATH=. python tests/test_6.py [liczba_ludzi]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from human import Human, WORLD_FIELDS
+from humanity import Humanity
+
+HUMANS = 100_000
+
+
+def measure(label, factory, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = factory()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{label:<40} {used / count:10.1f} B/human  ({used / 2**20:8.2f} MiB)")
+    return result, used
+
+
+def dict_human_class():
+    """Human o tych samych polach, ale z __dict__ i słownikiem/listą tworzonymi od razu."""
+    specs = []
+    for f in fields(Human):
+        if f.name in ("memory", "future_plans"):
+            specs.append((f.name, object, field(default_factory=dict if f.name == "memory" else list)))
+        elif f.name.startswith("_"):
+            continue
+        else:
+            default = getattr(Human, f.name) if f.name in WORLD_FIELDS else f.default
+            specs.append((f.name, object, field(default=default)))
+    return make_dataclass("DictHuman", specs)
+
+
+def populate(count):
+    world = Humanity(seed=0)
+    world.create_humans(count)
+    return world
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else HUMANS
+    print(f"Pamięć dla {count} ludzi")
+    DictHuman = dict_human_class()
+
+    _, slotted = measure("Human (__slots__)", lambda: [Human(id=i, name="Jan") for i in range(count)], count)
+    _, plain = measure("Human z __dict__ (porównanie)", lambda: [DictHuman(id=i, name="Jan") for i in range(count)], count)
+    _, world = measure("Humanity.create_humans", lambda: populate(count), count)
+    print(f"Oszczędność na obiekcie: {plain / slotted:.1f}x")
+
+    assert slotted < plain
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Test harmonogramu efektów statusu (StatusEngine).
+
+Sprawdza ponowną rejestrację efektu z callbackiem on_tick i bez niego
+oraz porównuje wygasanie efektów z prostym odliczaniem w słowniku.
+
+Uruchomienie:
+    PYTHONPATH=. python tests/test_7.py
+"""
+
+import numpy as np
+from status_effects import StatusEngine
+
+
+def test_register_without_tick_stops_ticking():
+    engine = StatusEngine()
+    ticks = []
+    engine.register("burn", on_tick=lambda ids: ticks.append(ids.tolist()))
+    engine.apply(3, "burn", 4)
+    engine.step()
+    engine.register("burn")  # bez on_tick - step() nie może wołać None
+    engine.step()
+    assert ticks == [[3]]
+    assert engine.remaining(3, "burn") == 2
+
+
+def test_register_with_tick_after_apply():
+    engine = StatusEngine()
+    ticks = []
+    engine.apply(1, "poison", 5)
+    engine.apply(2, "poison", 1)
+    engine.register("poison", on_tick=lambda ids: ticks.append(sorted(ids.tolist())))
+    engine.step()
+    engine.step()
+    assert ticks == [[1, 2], [1]]
+
+
+def test_expiry_matches_countdown():
+    rng = np.random.default_rng(0)
+    engine = StatusEngine()
+    engine.register("bleed")
+    countdown = {}
+    for _ in range(200):
+        entity = int(rng.integers(50))
+        duration = int(rng.integers(1, 10))
+        engine.apply(entity, "bleed", duration)
+        countdown[entity] = duration
+        expired = {entity for entity, _ in engine.step()}
+        countdown = {e: left - 1 for e, left in countdown.items()}
+        assert expired == {e for e, left in countdown.items() if left == 0}
+        countdown = {e: left for e, left in countdown.items() if left > 0}
+        assert len(engine) == len(countdown)
+
+
+def main():
+    for test in (test_register_without_tick_stops_ticking,
+                 test_register_with_tick_after_apply,
+                 test_expiry_matches_countdown):
+        test()
+        print(f"{test.__name__}: OK")
+
+
+if __name__ == "__main__":
+    main()
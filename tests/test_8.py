@@ -0,0 +1,89 @@
+"""
+Test wsadowych zmian zdrowia i doświadczenia (CharacterPool).
+
+Porównuje apply_health i apply_exp z kolejnymi wywołaniami change_health
+i change_exp na osobnych postaciach, także gdy jedna postać dostaje wiele
+zdarzeń w jednej partii.
+
+Uruchomienie:
+    PYTHONPATH=. python tests/test_8.py
+"""
+
+import numpy as np
+from character import Character, CharacterPool
+
+
+def make_pool(count, health=100, exp=0):
+    pool = CharacterPool()
+    for _ in range(count):
+        character = Character(0, 0, {})
+        character.health = health
+        character.exp = exp
+        pool.add(character)
+    return pool
+
+
+def make_twins(count, health=100, exp=0):
+    characters = []
+    for _ in range(count):
+        character = Character(0, 0, {})
+        character.health = health
+        character.exp = exp
+        characters.append(character)
+    return characters
+
+
+def test_health_events_in_order():
+    pool = make_pool(1)
+    died = pool.apply_health([0, 0], [-150, 50])
+    assert pool.health[0] == 50
+    assert died.tolist() == [0] and not pool.alive[0]
+
+    pool = make_pool(1, health=50)
+    pool.apply_health([0, 0], [100, -30])
+    assert pool.health[0] == Character.MAX_HEALTH - 30
+
+
+def test_exp_events_in_order():
+    pool = make_pool(1, exp=50)
+    pool.apply_exp([0, 0], [-100, 100])
+    assert pool.lvl[0] == 1 and pool.exp[0] == 0  # 100 pkt bez ucięcia do 50 - awans
+
+
+def test_batch_matches_sequential():
+    rng = np.random.default_rng(0)
+    count = 20
+    for _ in range(50):
+        ids = rng.integers(count, size=60)
+        deltas = rng.integers(-80, 80, size=60)
+        amounts = rng.integers(-150, 250, size=60)
+
+        pool = make_pool(count, health=60, exp=30)
+        twins = make_twins(count, health=60, exp=30)
+        died = set(pool.apply_health(ids, deltas).tolist())
+        pool.apply_exp(ids, amounts)
+
+        lowest = {}
+        for entity, delta, amount in zip(ids.tolist(), deltas.tolist(), amounts.tolist()):
+            twins[entity].change_health(delta)
+            twins[entity].change_exp(amount)
+            lowest[entity] = min(lowest.get(entity, twins[entity].health), twins[entity].health)
+        for twin in twins:
+            twin.update()
+
+        assert pool.health[:count].tolist() == [twin.health for twin in twins]
+        assert pool.exp[:count].tolist() == [twin.exp for twin in twins]
+        assert pool.lvl[:count].tolist() == [twin.lvl for twin in twins]
+        assert died == {entity for entity, health in lowest.items() if health <= 0}
+
+
+def main():
+    for test in (test_health_events_in_order,
+                 test_exp_events_in_order,
+                 test_batch_matches_sequential):
+        test()
+        print(f"{test.__name__}: OK")
+
+
+if __name__ == "__main__":
+    main()
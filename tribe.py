@@ -0,0 +1,121 @@
+"""
+Tribe with incrementally maintained trait aggregates.
+
+A Tribe keeps a set of members together with running sums of every
+character trait, so its size, strength (mean courage), wisdom (mean
+intelligence) or any other trait mean are read in O(1) instead of being
+recomputed from all members.
+
+Example:
+    >>> import numpy as np
+    >>> tribe = Tribe("Wilkowie", leader="Mieszko")
+    >>> tribe.add("Dobrawa", np.full(10, 0.5))
+    >>> tribe.add("Bolesław", np.full(10, 0.9))
+    >>> round(tribe.strength, 2), tribe.size
+    (0.7, 2)
+    >>> tribe.remove("Bolesław", np.full(10, 0.9))
+    >>> round(tribe.mean('charisma'), 2)
+    0.5
+"""
+
+from typing import Any, Dict, Hashable, Set
+
+import numpy as np
+
+from human import TRAITS
+
+
+class Tribe:
+    """
+    Tribe of humans led by one leader.
+
+    Trait sums are updated with the trait values passed to add() and
+    remove(), so traits of members should not be changed while they
+    belong to the tribe.
+
+    Attributes:
+        name (str): Tribe name
+        leader (Human): Tribe leader (not counted as a member)
+        members (set[Human]): Tribe members
+        sums (np.ndarray): Sum of every trait (columns as human.TRAITS) over members
+
+    Methods:
+        add(member, traits) -> None: Adds member with its trait row.
+        remove(member, traits) -> None: Removes member with its trait row.
+        absorb(other) -> None: Moves all members of other tribe into this one.
+        mean(trait) -> float: Mean value of a trait among members.
+        to_dict() -> dict: Tribe info in the format of Humanity.get_tribe_info.
+    """
+
+    def __init__(self, name: str, leader: Hashable) -> None:
+        self.name: str = name
+        self.leader = leader
+        self.members: Set[Hashable] = set()
+        self.sums: np.ndarray = np.zeros(len(TRAITS), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, human: object) -> bool:
+        return human in self.members
+
+    def __repr__(self) -> str:
+        return f"Tribe({self.name!r}, size={self.size})"
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    def add(self, member: Hashable, traits: np.ndarray) -> None:
+        """Add member with given trait values."""
+        if member in self.members:
+            return
+        self.members.add(member)
+        self.sums += traits
+
+    def remove(self, member: Hashable, traits: np.ndarray) -> None:
+        """Remove member with given trait values."""
+        if member not in self.members:
+            return
+        self.members.discard(member)
+        self.sums -= traits
+        if not self.members:
+            self.sums[:] = 0.0  # usuwa błąd zaokrągleń
+
+    def absorb(self, other: "Tribe") -> None:
+        """
+        Move all members of other tribe into this one (other is left empty).
+
+        The bigger member set is kept and the smaller one is merged into it.
+        """
+        if len(other.members) > len(self.members):
+            self.members, other.members = other.members, self.members
+        self.members |= other.members
+        self.sums += other.sums
+        other.members = set()
+        other.sums = np.zeros_like(other.sums)
+
+    def mean(self, trait: str) -> float:
+        """Return mean value of trait among members (0.0 for empty tribe)."""
+        if not self.members:
+            return 0.0
+        return float(self.sums[TRAITS.index(trait)] / len(self.members))
+
+    @property
+    def strength(self) -> float:
+        return self.mean('courage')
+
+    @property
+    def wisdom(self) -> float:
+        return self.mean('intelligence')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return tribe info as a dictionary."""
+        return {
+            'name': self.name,
+            'leader': self.leader,
+            'members': list(self.members),
+            'size': self.size,
+            'strength': self.strength,
+            'wisdom': self.wisdom
+        }